@@ -0,0 +1,49 @@
+# budget_optimizer/__init__.py
+"""
+Budget Optimizer package.
+
+Semua simbol publik di-load secara *lazy* lewat module-level ``__getattr__``
+(PEP 562). ``import budget_optimizer`` tidak menarik numpy/scipy/matplotlib,
+sehingga cold start worker Streamlit tetap ringan. Modul berat baru di-import
+saat atributnya pertama kali diakses.
+"""
+
+import importlib
+
+# nama atribut -> modul (relatif terhadap package ini)
+_LAZY_ATTRS = {
+    "State": ".models",
+    "Action": ".models",
+    "Node": ".models",
+    "CATEGORIES": ".config",
+    "MINIMUMS": ".config",
+    "BOBOT": ".config",
+    "astar_search": ".astar",
+    "astar_iter": ".astar",
+    "greedy_optimize": ".greedy",
+    "greedy_iter": ".greedy",
+    "simulated_annealing": ".simulated_annealing",
+    "simulated_annealing_iter": ".simulated_annealing",
+    "tabu_search": ".tabu_search",
+    "tabu_search_iter": ".tabu_search",
+    "population_annealing": ".population_annealing",
+    "BudgetSolver": ".budget_solver",
+    "BudgetVisualizer": ".budget_visualizer",
+    "AIRouter": ".genai.ai_router",
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # cache, __getattr__ tidak dipanggil lagi
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,55 @@
+# budget_optimizer/__main__.py
+"""
+CLI: python -m budget_optimizer batch INPUT -o OUTPUT [opsi]
+
+Contoh:
+  python -m budget_optimizer batch users.csv -o hasil.jsonl --workers 8
+  python -m budget_optimizer batch users.jsonl -o hasil.jsonl --resume
+"""
+
+import argparse
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m budget_optimizer")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="solve budget dari file CSV / JSONL")
+    batch.add_argument("input", help="file input (.csv atau .jsonl)")
+    batch.add_argument("-o", "--output", required=True, help="file output JSONL")
+    batch.add_argument("--format", choices=["csv", "jsonl"], default=None)
+    batch.add_argument("--workers", type=int, default=1, help="jumlah proses")
+    batch.add_argument(
+        "--unordered",
+        action="store_true",
+        help="tulis hasil sesuai urutan selesai (lebih cepat)",
+    )
+    batch.add_argument("--chunksize", type=int, default=64)
+    batch.add_argument("--resume", action="store_true", help="lanjut dari checkpoint")
+    batch.add_argument("--max-nodes", type=int, default=60000)
+
+    args = parser.parse_args(argv)
+
+    from .batch import run_batch
+
+    stats = run_batch(
+        args.input,
+        args.output,
+        fmt=args.format,
+        workers=args.workers,
+        ordered=not args.unordered,
+        chunksize=args.chunksize,
+        resume=args.resume,
+        router_kwargs={"max_nodes": args.max_nodes},
+    )
+    print(
+        f"processed={stats['processed']} skipped={stats['skipped']} "
+        f"errors={stats['errors']}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,7 +24,6 @@ from typing import Dict, Any, Optional
 from budget_optimizer.genai.llm_client import llm_text, llm_json
 from budget_optimizer.genai.preference_ai import interpret_preferences
 from budget_optimizer.genai.advisor import generate_advice
-from budget_optimizer.genai.ai_router import AIRouter
 from budget_optimizer.utils import normalize_state
 from budget_optimizer.config import MINIMUMS, CATEGORIES
 
@@ -50,6 +49,7 @@ st.title("💬 Smart Budget Assistant (Chat Mode)")
 # - solver_output: dict (result from router)
 # - target_tabungan: int (optional)
 # - delta: int
+# - solver_job: SolveJob yang sedang berjalan (atau None)
 
 if "messages" not in st.session_state:
     st.session_state["messages"] = (
@@ -89,6 +89,9 @@ if "solver_trace" not in st.session_state:
 if "solver_constraints" not in st.session_state:
     st.session_state.solver_constraints = None
 
+if "solver_job" not in st.session_state:
+    st.session_state["solver_job"] = None
+
 
 # Small helper to pretty-print Rupiah integers
 def rupiah(x: int) -> str:
@@ -450,50 +453,143 @@ def show_baseline_mode():
             "⚠️ Target di atas 50% mungkin bikin dompet 'sesak'. Pastikan kamu sanggup ya!"
         )
 
+    # 4. Preview instan: semua posisi slider dihitung sekali (warm-start
+    #    min-cost flow) dan di-cache per baseline → geser slider tanpa solve ulang
+    show_target_preview(baseline, income, max_saving_limit, target_user)
+
     st.markdown("---")
 
     # ============================================================
     # TOMBOL RUN SOLVER
     # ============================================================
-    if st.button("Run Solver"):
+    job = st.session_state.get("solver_job")
+
+    if st.button("Run Solver", disabled=job is not None):
         if st.session_state.get("baseline") is None:
             st.error("⚠️ Data baseline belum lengkap!")
         else:
-            from budget_optimizer.genai.ai_router import AIRouter
+            from budget_optimizer.genai.solver_jobs import submit_solve
 
             # HAPUS baris import MINIMUMS di sini agar tidak konflik scope
             # from budget_optimizer.config import MINIMUMS  <-- INI PENYEBAB ERRORNYA
 
-            router = AIRouter()
-            baseline_data = st.session_state["baseline"]
-
-            income_val = st.session_state["detected_income"]
-            target_val = st.session_state["target_tabungan"]
-            delta_val = st.session_state.get("delta", 50000)
-
-            with st.spinner(
-                f"Mencari cara menabung Rp {target_val:,} tanpa menyiksa..."
-            ):
-                result = router.solve(
-                    state=baseline_data,
-                    income=income_val,
-                    minimums=MINIMUMS,  # Menggunakan global variable
-                    target=target_val,
-                    delta=delta_val,
-                )
-
-            # Simpan hasil
-            st.session_state.final_budget = result.get("final_state")
-            st.session_state.solver_trace = result.get("trace")
-            st.session_state.solver_constraints = MINIMUMS
-            st.session_state["solver_output"] = {
-                "result": result,
-                "final_state": result.get("final_state"),
-            }
-
-            st.success("Solver selesai dijalankan!")
+            # Solve jalan di executor bersama → script thread tidak ter-block.
+            # Progress di-poll oleh fragment show_solver_progress().
+            inputs = solver_inputs_key(st.session_state["baseline"], MINIMUMS)
+            st.session_state["solver_inputs"] = inputs
+            st.session_state["solver_job"] = submit_solve(
+                st.session_state["baseline"],
+                st.session_state["detected_income"],
+                MINIMUMS,  # Menggunakan global variable
+                st.session_state["target_tabungan"],
+                st.session_state.get("delta", 50000),
+                # baseline & minimum sama → hasil run sebelumnya jadi titik
+                # awal solver; perubahan income / target ditangani router
+                warm_start=(
+                    st.session_state.get("final_budget")
+                    if st.session_state.get("final_budget_inputs") == inputs
+                    else None
+                ),
+            )
             st.rerun()
 
+    if st.session_state.get("solver_job") is not None:
+        show_solver_progress()
+
+
+# ------------------------------------------------------------
+# PREVIEW INSTAN TARGET TABUNGAN (parametric sweep)
+# ------------------------------------------------------------
+def show_target_preview(baseline: dict, income: int, max_target: int, target: int):
+    from budget_optimizer.transfer_planner import pareto_front, sweep_targets
+
+    # grid preview = step solver, supaya titiknya sama dengan hasil Run Solver
+    delta = st.session_state.get("delta", 50000)
+    targets = sorted(set(range(0, max_target + 1, delta)) | {target})
+    sweep = sweep_targets(baseline, income, MINIMUMS, targets, delta)
+    point = sweep[targets.index(target)]
+
+    with st.expander("⚡ Preview instan (tanpa Run Solver)", expanded=True):
+        if point["status"] != "success":
+            st.warning(
+                "Target ini tidak bisa dicapai dengan income & minimum saat ini."
+            )
+        else:
+            col1, col2 = st.columns(2)
+            col1.metric("Tabungan", rupiah(point["savings"]))
+            col2.metric("Friksi", f"{point['friction']:,.0f}")
+            for a in point["actions"]:
+                st.write(f"- {a.src} → {a.dst}: {rupiah(a.amount)}")
+
+        front = pareto_front(sweep)
+        if len(front) > 1:
+            st.caption("Kurva Pareto: makin besar tabungan, makin besar friksinya.")
+            st.line_chart(
+                {
+                    "tabungan": [p["savings"] for p in front],
+                    "friksi": [p["friction"] for p in front],
+                },
+                x="tabungan",
+                y="friksi",
+            )
+
+
+# ------------------------------------------------------------
+# SIMPAN HASIL SOLVER KE SESSION
+# ------------------------------------------------------------
+def solver_inputs_key(baseline: dict, minimums: dict) -> tuple:
+    """Baseline + minimum yang dipakai solve (syarat warm start)."""
+    return tuple(sorted(baseline.items())), tuple(sorted(minimums.items()))
+
+
+def store_solver_result(result: dict):
+    st.session_state.final_budget = result.get("final_state")
+    st.session_state["final_budget_inputs"] = st.session_state.get("solver_inputs")
+    st.session_state.solver_trace = result.get("trace")
+    st.session_state.solver_constraints = MINIMUMS
+    st.session_state["solver_output"] = {
+        "result": result,
+        "final_state": result.get("final_state"),
+    }
+
+
+# ------------------------------------------------------------
+# PROGRESS SOLVER (auto-refresh fragment, polling job handle)
+# ------------------------------------------------------------
+@st.fragment(run_every=0.5)
+def show_solver_progress():
+    job = st.session_state.get("solver_job")
+    if job is None:
+        return
+
+    if job.done():
+        result = job.result()
+        st.session_state["solver_job"] = None
+
+        if result.get("status") != "cancelled":
+            store_solver_result(result)
+        st.rerun()  # rerun seluruh app supaya panel hasil muncul
+        return
+
+    target_val = st.session_state.get("target_tabungan", 0)
+    info = job.progress()
+
+    st.info(f"⏳ Mencari cara menabung Rp {target_val:,} tanpa menyiksa...")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Tier", info.get("tier") or "antre")
+    with col2:
+        st.metric("Nodes / Steps", info.get("nodes", info.get("steps", 0)))
+    with col3:
+        best = info.get("best_h", info.get("best_score"))
+        st.metric("Best h", "-" if best is None else f"{best:,.0f}")
+
+    if job.cancelled:
+        st.caption("Membatalkan solver...")
+    elif st.button("⏹️ Batalkan Solver"):
+        job.cancel()
+
 
 # Bagian tampilan panel ini tetap di luar "if st.button" agar tetap muncul setelah rerun
 # if st.session_state.get("final_budget") is not None:
@@ -559,44 +655,12 @@ if (
     baseline_state = st.session_state["baseline"]
     final_state = st.session_state["final_budget"]
 
-    import plotly.express as px
-    import pandas as pd
+    from budget_optimizer.budget_visualizer import plotly_pie_spec
 
     st.subheader("🥧 Final Budget Distribution (Interactive)")
 
-    # Siapkan data dalam bentuk DataFrame agar lebih rapi
-    df_chart = pd.DataFrame(
-        {"Kategori": list(final_state.keys()), "Jumlah": list(final_state.values())}
-    )
-
-    # Hapus kategori yang nilainya 0 agar chart tidak penuh label kosong
-    df_chart = df_chart[df_chart["Jumlah"] > 0]
-
-    # Buat Donut Chart yang modern
-    fig_pie = px.pie(
-        df_chart,
-        values="Jumlah",
-        names="Kategori",
-        hole=0.4,  # Membuat lubang di tengah (Donut Chart)
-        color_discrete_sequence=px.colors.qualitative.Pastel,  # Palet warna pastel yang lembut
-        title="Alokasi Anggaran Final",
-    )
-
-    # Kustomisasi tampilan: Tampilkan persentase dan label di dalam slice
-    fig_pie.update_traces(
-        textposition="inside",
-        textinfo="percent+label",
-        hoverinfo="label+percent+value",  # Tooltip interaktif saat di-hover
-    )
-
-    # Rapikan layout
-    fig_pie.update_layout(
-        showlegend=False,  # Sembunyikan legenda agar lebih bersih
-        margin=dict(t=40, b=0, l=0, r=0),  # Kurangi margin kosong
-    )
-
-    # Tampilkan chart di Streamlit dengan lebar penuh
-    st.plotly_chart(fig_pie, use_container_width=True)
+    # Spec donut chart di-cache per data budget → rerun tidak membangun ulang figure
+    st.plotly_chart(plotly_pie_spec(final_state), use_container_width=True)
 
 # ================================
 # 🤝 ADVISOR PANEL (AI Suggestions) — FULL PACKAGE
@@ -765,8 +829,9 @@ if (
     final_state = st.session_state["final_budget"]
     income = st.session_state.get("detected_income", 0)
 
-    import matplotlib.pyplot as plt
-    import numpy as np
+    # Library chart di-import di dalam panel (bukan di top-level) supaya
+    # cold start halaman chat tidak ikut membayar import plotly.
+    from budget_optimizer.budget_visualizer import plotly_radar_spec
 
     # ============================================================
     # 1. FINANCIAL HEALTH SCORE (0–100)
@@ -810,36 +875,7 @@ if (
     # ============================================================
     st.subheader("🕸 Financial Radar Chart (Balanced Structure)")
 
-    # Siapkan data untuk Plotly
-    categories = list(final_state.keys())
-    values = list(final_state.values())
-
-    df_radar = pd.DataFrame({"Kategori": categories, "Jumlah": values})
-
-    # Buat Radar Chart interaktif
-    fig_radar = px.line_polar(
-        df_radar,
-        r="Jumlah",
-        theta="Kategori",
-        line_close=True,  # Menutup garis loop (jaring laba-laba)
-        title="Peta Keseimbangan Anggaran",
-    )
-
-    # Styling: Isi area dalam (fill), warna modern
-    fig_radar.update_traces(fill="toself", line_color="#00CC96")
-
-    # Layout cleaning
-    fig_radar.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                showticklabels=False,  # Sembunyikan angka sumbu agar tidak ruwet
-            )
-        ),
-        margin=dict(t=40, b=20, l=40, r=40),
-    )
-
-    st.plotly_chart(fig_radar, use_container_width=True)
+    st.plotly_chart(plotly_radar_spec(final_state), use_container_width=True)
     # ============================================================
     # 3. SPENDING CONSISTENCY GAUGE
     # ============================================================
@@ -1045,6 +1081,17 @@ def show_final_result(result: dict):
     st.markdown("### 💵 Final Allocated Budget")
     st.json(final_state)
 
+    # ===========================
+    # RENCANA PEMINDAHAN (min-cost flow)
+    # ===========================
+    plan = result_core.get("plan") or []
+    if plan:
+        st.markdown("### 🔁 Rencana Pemindahan")
+        for action in plan:
+            src = "sisa income" if action.src == "income" else action.src
+            dst = "potong overspend" if action.dst == "income" else action.dst
+            st.write(f"- Pindahkan **{rupiah(action.amount)}** dari `{src}` ke `{dst}`")
+
     # ===========================
     # TRACE (A* / Greedy / SA / LLM)
     # ===========================
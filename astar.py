@@ -1,8 +1,30 @@
 # budget_optimizer/astar.py
 
 import heapq
-from copy import deepcopy
 import itertools
+import math
+import sys
+import time
+
+from .config import BOBOT
+from .lattice import LatticeEncoder, VisitedSet
+from .utils import drain, improvement, seed_state
+
+# Seberapa sering (dalam jumlah ekspansi) callback progress dipanggil
+PROGRESS_EVERY = 256
+
+# Lebar default mode "beam" (state per layer)
+BEAM_WIDTH = 64
+
+# Weighted A* anytime: epsilon ronde berikutnya = epsilon * decay,
+# di bawah EPSILON_MIN langsung ke 0 (A* biasa)
+EPSILON_DECAY = 0.5
+EPSILON_MIN = 0.01
+
+# Estimasi memori frontier: byte per entry heap di luar dict state-nya
+# (tuple entry + float g/h + int code), dan per entry tabel g (weighted)
+HEAP_ENTRY_BYTES = 120
+G_ENTRY_BYTES = 100
 
 
 def heuristic(state, income, minimums, target):
@@ -36,91 +58,689 @@ def heuristic(state, income, minimums, target):
     return h
 
 
-def neighbors(state, delta, minimums):
+def friction(before, after, weights=None):
+    """Biaya friksi Σ w_c · |after_c − before_c| (satuan sama dengan g)."""
+    w = BOBOT if weights is None else weights
+    return sum(w.get(c, 1.0) * abs(after[c] - before.get(c, 0)) for c in after)
+
+
+def lower_bound(state, income, minimums, target, weights=None, delta=None):
+    """
+    Batas bawah (admissible) friksi yang masih harus dibayar untuk mencapai
+    goal dari ``state``:
+      - setiap rupiah kekurangan minimum harus dinaikkan (w kategori itu)
+      - tabungan harus digeser tepat ke target (w tabungan)
+      - overspend yang tersisa setelah itu harus dipotong; paling murah
+        dari w terkecil dulu, tiap kategori paling banyak sampai minimumnya
+        (inf jika tidak cukup). Tabungan ikut jadi ruang potong hanya tanpa
+        target — dengan target posisinya sudah dikunci di target
+
+    delta: jika diisi, ruang potong dibulatkan ke kelipatan delta (move
+    hanya ±delta) → bound lebih ketat, tetap admissible.
+    """
+    w = BOBOT if weights is None else weights
+    lb = 0.0
+    spend = sum(state.values())
+
+    for cat, minv in minimums.items():
+        if cat == "tabungan" and target:
+            continue
+        short = minv - state.get(cat, 0)
+        if short > 0:
+            lb += w.get(cat, 1.0) * short
+            spend += short
+
+    if target:
+        shift = target - state.get("tabungan", 0)
+        lb += w.get("tabungan", 1.0) * abs(shift)
+        spend += shift
+
+    # potong overspend dari w termurah dulu, sebatas ruang di atas minimum
+    # (versi pecahan dari knapsack → tetap batas bawah)
+    over = spend - income
+    if over > 0:
+        rooms = sorted(
+            (w.get(c, 1.0), _cut_room(c, v, minimums, target)) for c, v in state.items()
+        )
+        for wc, room in rooms:
+            if delta:
+                room -= room % delta
+            cut = min(room, over)
+            lb += wc * cut
+            over -= cut
+            if over <= 0:
+                break
+        else:
+            return math.inf  # ruang tidak cukup: goal tidak terjangkau
+
+    return lb
+
+
+def _cut_room(cat, val, minimums, target):
+    """
+    Berapa banyak ``cat`` masih boleh dipotong menuju goal. Tabungan
+    ber-target sudah digeser tepat ke target (goal: tabungan = target),
+    jadi ruangnya 0; tanpa target sama seperti kategori lain.
+    """
+    if cat == "tabungan" and target:
+        return 0
+    return max(val - minimums.get(cat, 0), 0)
+
+
+def _dominated_up(cat, val, minimums, target):
+    """+delta pada kategori ini tidak pernah mendekatkan ke goal."""
+    if cat == "tabungan" and target:
+        return val >= target  # menjauh dari target
+    # sudah ≥ minimum: menaikkan hanya menambah spend (h tidak bisa turun)
+    return val >= minimums.get(cat, 0)
+
+
+def neighbors(state, delta, minimums, target=None, prune_dominated=False):
     """
     Menghasilkan tetangga (neighbors) dari state:
     - Naikkan kategori +delta
     - Turunkan kategori -delta (tidak boleh < minimum)
+
+    prune_dominated:
+        buang move yang terbukti tidak berguna untuk goal heuristic
+        (spend ≤ income, semua ≥ minimum, tabungan = target):
+        - menaikkan kategori yang sudah ≥ minimum (selain tabungan ber-target)
+        - menaikkan tabungan yang sudah ≥ target
+        - menurunkan tabungan yang sudah ≤ target
+        Branching factor turun dari ~2n ke ~n. Matikan untuk objective
+        lain yang memang bisa diuntungkan oleh move tersebut.
     """
     neigh = []
 
-    for cat in state.keys():
+    for cat, val in state.items():
         # Up
-        up = deepcopy(state)
-        up[cat] += delta
-        neigh.append(up)
+        if not (prune_dominated and _dominated_up(cat, val, minimums, target)):
+            up = dict(state)
+            up[cat] += delta
+            neigh.append(up)
 
         # Down
-        if state[cat] - delta >= minimums.get(cat, 0):
-            down = deepcopy(state)
+        if val - delta >= minimums.get(cat, 0):
+            if prune_dominated and cat == "tabungan" and target and val <= target:
+                continue
+            down = dict(state)
             down[cat] -= delta
             neigh.append(down)
 
     return neigh
 
 
-def astar_search(init_state, income, minimums, target=None, delta=50000, max_iter=1000):
+def _result(state, status, trace, stats):
+    return {
+        "final_state": state,
+        "method": "astar",
+        "status": status,
+        "trace": trace,
+        "stats": stats,
+    }
+
+
+def _expander(
+    income, minimums, target, delta, upper_bound, w, prune_dominated, stats, lattice
+):
     """
-    A* Hybrid — versi ringan.
+    Ekspansi bersama semua mode: ``expand(state, g, limit, code)`` → list
+    ``(nb, cat, ng, nh, ncode)``. g anak = g + w_cat · delta; anak dengan
+    g + lower_bound ≥ ``limit`` (default upper_bound) di-prune. ncode =
+    code lattice anak, diturunkan O(1) dari code parent.
     """
 
-    start_h = heuristic(init_state, income, minimums, target)
+    def expand(state, g, limit=upper_bound, code=None):
+        children = []
+        for nb in neighbors(state, delta, minimums, target, prune_dominated):
+            # satu kategori berubah tepat delta
+            cat = next(c for c in nb if nb[c] != state[c])
+            ng = g + delta * w.get(cat, 1.0)
+            if limit is not None:
+                if ng + lower_bound(nb, income, minimums, target, w, delta) >= limit:
+                    stats["pruned"] += 1
+                    continue
+            nh = heuristic(nb, income, minimums, target)
+            step = 1 if nb[cat] > state[cat] else -1
+            children.append((nb, cat, ng, nh, lattice.shift(code, cat, nb[cat], step)))
+            stats["generated"] += 1
+        return children
 
-    # Counter unik untuk tie-breaker
-    counter = itertools.count()
+    return expand
 
-    # Priority queue: (score, count, state)
-    pq = []
-    heapq.heappush(pq, (start_h, next(counter), init_state))
 
-    visited = set()
-    trace = []
-    best = init_state
-    best_h = start_h
+def astar_iter(
+    init_state,
+    income,
+    minimums,
+    target=None,
+    delta=50000,
+    max_iter=1000,
+    progress=None,
+    warm_start=None,
+    upper_bound=None,
+    weights=None,
+    prune_dominated=True,
+    mode="astar",
+    beam_width=BEAM_WIDTH,
+    epsilon=None,
+    deadline_ms=None,
+    memory_cap=None,
+):
+    """
+    A* Hybrid — versi ringan, sebagai generator anytime.
+
+    Yield ``improvement`` (final_state, score, stats) setiap kali state
+    terbaik membaik — score = h, atau friksi (cost) untuk weighted A*.
+    Yield pertama = start node, jadi caller langsung punya budget. Nilai
+    ``return`` generator = result akhir (lihat ``astar_search``).
+
+    upper_bound:
+        friksi solusi yang sudah ada (mis. hasil greedy). Node dengan
+        g + lower_bound ≥ upper_bound tidak mungkin lebih baik → di-prune.
+        g = friksi akumulasi move (w_cat · delta per langkah).
+
+    prune_dominated:
+        lewati move yang didominasi (lihat ``neighbors``). False = ekspansi
+        penuh ±delta untuk semua kategori.
+
+    warm_start:
+        solusi sebelumnya (mis. target / income baru sedikit berubah).
+        Ikut di-push sebagai start node kedua, sehingga re-solve kecil
+        cukup beberapa ekspansi dari sekitar solusi lama.
+
+    progress:
+        callable opsional ``progress(info)`` yang dipanggil tiap
+        PROGRESS_EVERY ekspansi dengan ``{"nodes": ..., "best_h": ...}``.
+        Jika mengembalikan ``False``, pencarian dihentikan dengan
+        status "cancelled" (dipakai job runner UI untuk cancel).
+
+    mode:
+        "astar" — best-first pada h, heap + visited set tumbuh sampai
+                  ``max_iter`` ekspansi (perilaku lama)
+        "beam"  — per layer hanya ``beam_width`` state terbaik (h) yang
+                  disimpan; memori O(beam_width · n), tidak complete
+        "ida"   — IDA*: DFS dengan threshold f = g + lower_bound yang
+                  dinaikkan per iterasi; memori O(kedalaman · n). Solusi
+                  pertama = friksi minimum (lower_bound admissible)
+
+    epsilon:
+        None → best-first pada h (perilaku lama). Angka ≥ 0 → weighted A*
+        dengan f = g + (1 + epsilon) · lower_bound: friksi solusi dijamin
+        ≤ (1 + epsilon) × optimum. Hanya untuk mode "astar".
+    deadline_ms:
+        bersama epsilon: setelah solusi pertama, cari ulang dengan epsilon
+        yang terus dikecilkan (EPSILON_DECAY) dan friksi incumbent sebagai
+        upper bound — gaya ARA* (anytime) — sampai terbukti optimal,
+        deadline habis, atau ``max_iter`` tercapai.
+
+    memory_cap:
+        batas perkiraan memori (byte) per pencarian untuk mode "astar"
+        (termasuk weighted): frontier × ukuran entry + visited set /
+        tabel g. Jika tercapai, frontier dipangkas ke ``beam_width`` entry
+        terbaik (degradasi ke beam) — tidak complete lagi, dan untuk
+        weighted A* jaminan bound hilang (suboptimality_bound None).
+        Jika visited set / tabel g sendiri ≥ cap, visited dibekukan (hanya
+        dicek, tidak ditambah) dan tabel g dipangkas ke frontier.
+        Degradasi pertama (dan pembekuan visited) dicatat di trace,
+        jumlahnya di stats["degraded"].
+
+    stats: nodes (ekspansi), generated, pruned, degraded, dan
+    "frontier_peak" — jumlah state terbanyak di frontier sekaligus. Dengan
+    epsilon juga "cost" (friksi solusi), "suboptimality_bound" (cost ≤
+    bound × optimum) dan "rounds".
+    """
+    if mode not in ("astar", "beam", "ida"):
+        raise ValueError(f"mode tidak dikenal: {mode!r}")
+    if epsilon is not None:
+        if mode != "astar":
+            raise ValueError("epsilon hanya untuk mode 'astar'")
+        if epsilon < 0:
+            raise ValueError("epsilon harus ≥ 0")
+        mode = "weighted"
+
+    w = BOBOT if weights is None else weights
 
     # Tambahkan key 'tabungan' ke init_state jika belum ada, biar aman
+    # (sebelum warm start di-seed, supaya kategori kedua start sama)
     if "tabungan" not in init_state:
         init_state["tabungan"] = 0
 
-    for _ in range(max_iter):
+    starts = [init_state]
+    if warm_start is not None:
+        starts.append(seed_state(init_state, warm_start))
+    # state A* = titik lattice delta; visited / dedupe memakai code integer
+    lattice = LatticeEncoder(
+        starts, minimums, delta, target, income, bounded_up=prune_dominated
+    )
+    starts = [
+        (
+            heuristic(start, income, minimums, target),
+            friction(init_state, start, w),
+            start,
+            lattice.encode(start),
+        )
+        for start in starts
+    ]
+
+    trace = []
+    stats = {
+        "nodes": 0,
+        "generated": 0,
+        "pruned": 0,
+        "degraded": 0,
+        "frontier_peak": len(starts),
+    }
+    memory = _MemoryGuard(
+        memory_cap, sys.getsizeof(init_state) + HEAP_ENTRY_BYTES, beam_width
+    )
+
+    expand = _expander(
+        income,
+        minimums,
+        target,
+        delta,
+        upper_bound,
+        w,
+        prune_dominated,
+        stats,
+        lattice,
+    )
+    search = {
+        "astar": _best_first,
+        "beam": _beam,
+        "ida": _ida,
+        "weighted": _weighted,
+    }[mode]
+    return (
+        yield from search(
+            starts,
+            expand,
+            max_iter=max_iter,
+            progress=progress,
+            trace=trace,
+            stats=stats,
+            beam_width=beam_width,
+            bound=lambda s: lower_bound(s, income, minimums, target, w, delta),
+            upper_bound=upper_bound,
+            epsilon=epsilon,
+            deadline_ms=deadline_ms,
+            lattice=lattice,
+            memory=memory,
+        )
+    )
+
+
+def astar_search(*args, **kwargs):
+    """A* sampai selesai; parameter sama dengan ``astar_iter``. Return result."""
+    return drain(astar_iter(*args, **kwargs))
+
+
+class _MemoryGuard:
+    """
+    Perkiraan memori pencarian vs ``cap`` (byte). Saat tercapai, frontier
+    dipangkas ke ``beam_width`` entry terbaik (beam pruning). Jika struktur
+    lain (visited set / tabel g) sendiri sudah ≥ cap, caller juga berhenti
+    menumbuhkannya (lihat ``over``) — peak memory per request tetap terbatas.
+    """
+
+    def __init__(self, cap, entry_bytes, beam_width):
+        self.cap = cap
+        self.entry_bytes = entry_bytes
+        self.beam_width = beam_width
+
+    def over(self, other_bytes):
+        """True jika ``other_bytes`` saja sudah mencapai cap."""
+        return self.cap is not None and other_bytes >= self.cap
+
+    def check(self, pq, other_bytes, trace, stats):
+        """
+        True jika cap tercapai: frontier ``pq`` (heap, in-place) dipangkas
+        ke ``beam_width``, dan caller harus membatasi struktur lainnya.
+        """
+        if self.cap is None:
+            return False
+        used = len(pq) * self.entry_bytes + other_bytes
+        if used < self.cap:
+            return False
+        if len(pq) <= self.beam_width and not self.over(other_bytes):
+            return False
+
+        if len(pq) > self.beam_width:
+            pq[:] = heapq.nsmallest(self.beam_width, pq)  # terurut = heap valid
+        if not stats["degraded"]:
+            trace.append(
+                {
+                    "method": "astar",
+                    "status": "degraded",
+                    "detail": {
+                        "nodes": stats["nodes"],
+                        "memory_bytes": used,
+                        "memory_cap": self.cap,
+                        "beam_width": self.beam_width,
+                    },
+                }
+            )
+        stats["degraded"] += 1
+        return True
+
+
+# ============================================================
+# Mode "astar": best-first (heap + visited)
+# ============================================================
+def _best_first(
+    starts, expand, *, max_iter, progress, trace, stats, lattice, memory, **_
+):
+    # Counter unik untuk tie-breaker
+    counter = itertools.count()
+
+    # Priority queue: (score, count, state, g, code lattice)
+    pq = [(h, next(counter), start, g, code) for h, g, start, code in starts]
+    heapq.heapify(pq)
+
+    visited = VisitedSet(lattice)
+    frozen = False  # visited ≥ memory cap → tidak ditambah lagi
+    best_h, _, best, _, _ = pq[0]
+    yield improvement("astar", best, best_h, stats)
+
+    for it in range(max_iter):
         if not pq:
             break
 
-        # Unpack
-        h, _, state = heapq.heappop(pq)
+        if progress is not None and it % PROGRESS_EVERY == 0:
+            if progress({"nodes": it, "best_h": best_h}) is False:
+                return _result(best, "cancelled", trace, stats)
 
-        # Simpan trace untuk debugging (opsional, bisa dikurangi biar ringan)
-        # trace.append({"method": "astar", "status": f"h={h}"})
+        # Unpack
+        h, _, state, g, code = heapq.heappop(pq)
+        stats["nodes"] = it + 1
 
         # Update best state
         if h < best_h:
             best = state
             best_h = h
+            yield improvement("astar", best, best_h, stats)
 
         # Stop condition (heuristic 0 artinya sempurna)
         if h == 0:
-            return {
-                "final_state": state,
-                "method": "astar",
-                "status": "success",
-                "trace": trace,
-            }
-
-        # Avoid revisiting
-        key = tuple(sorted(state.items()))
-        if key in visited:
+            return _result(state, "success", trace, stats)
+
+        # Avoid revisiting (visited beku: hanya dicek, seperti dedupe beam)
+        if frozen:
+            if visited.has(state, code):
+                continue
+        elif not visited.add(state, code):
             continue
-        visited.add(key)
 
         # Expand neighbors
-        for nb in neighbors(state, delta, minimums):
-            nh = heuristic(nb, income, minimums, target)
-            heapq.heappush(pq, (nh, next(counter), nb))
+        for nb, _, ng, nh, ncode in expand(state, g, code=code):
+            heapq.heappush(pq, (nh, next(counter), nb, ng, ncode))
+        stats["frontier_peak"] = max(stats["frontier_peak"], len(pq))
+        if memory.check(pq, visited.nbytes, trace, stats) and not frozen:
+            frozen = memory.over(visited.nbytes)
+            if frozen:
+                trace.append(
+                    {
+                        "method": "astar",
+                        "status": "degraded",
+                        "detail": {
+                            "nodes": stats["nodes"],
+                            "visited_frozen": len(visited),
+                            "visited_bytes": visited.nbytes,
+                            "memory_cap": memory.cap,
+                        },
+                    }
+                )
 
     # End loop → return best found
-    return {
-        "final_state": best,
-        "method": "astar",
-        "status": "partial" if best_h > 0 else "success",
-        "trace": trace,
-    }
+    return _result(best, "partial" if best_h > 0 else "success", trace, stats)
+
+
+# ============================================================
+# Mode "beam": lebar tetap per layer
+# ============================================================
+def _beam(
+    starts, expand, *, max_iter, progress, trace, stats, beam_width, lattice, **_
+):
+    counter = itertools.count()
+    layer = heapq.nsmallest(
+        beam_width, [(h, next(counter), s, g, c) for h, g, s, c in starts]
+    )
+    best_h, _, best, _, _ = layer[0]
+    yield improvement("astar", best, best_h, stats)
+
+    while layer:
+        children, keys = [], set()
+        # state layer ini tidak boleh muncul lagi sebagai anak (mundur 1 langkah)
+        parents = {lattice.key(s, c) for _, _, s, _, c in layer}
+
+        for h, _, state, g, code in layer:
+            if stats["nodes"] >= max_iter:
+                return _result(best, "partial", trace, stats)
+            if progress is not None and stats["nodes"] % PROGRESS_EVERY == 0:
+                if progress({"nodes": stats["nodes"], "best_h": best_h}) is False:
+                    return _result(best, "cancelled", trace, stats)
+            stats["nodes"] += 1
+
+            if h < best_h:
+                best, best_h = state, h
+                yield improvement("astar", best, best_h, stats)
+            if h == 0:
+                return _result(state, "success", trace, stats)
+
+            for nb, _, ng, nh, ncode in expand(state, g, code=code):
+                key = lattice.key(nb, ncode)
+                if key in parents or key in keys:
+                    continue
+                keys.add(key)
+                children.append((nh, next(counter), nb, ng, ncode))
+
+        stats["frontier_peak"] = max(stats["frontier_peak"], len(children))
+        layer = heapq.nsmallest(beam_width, children)
+
+    return _result(best, "partial", trace, stats)
+
+
+# ============================================================
+# Mode "ida": iterative-deepening pada f = g + lower_bound
+# ============================================================
+def _ida(starts, expand, *, max_iter, progress, trace, stats, bound, upper_bound, **_):
+    """
+    Move antar kategori saling komutatif (biaya & syarat minimum per
+    kategori tidak bergantung urutan), jadi DFS hanya mengikuti urutan
+    kanonik: kategori anak ≥ kategori move terakhir. Permutasi jalur yang
+    sama tidak ditelusuri ulang, tanpa perlu visited set.
+    """
+    order = {c: i for i, c in enumerate(starts[0][2])}
+    best_h, _, best, _ = min(starts, key=lambda s: s[0])
+    yield improvement("astar", best, best_h, stats)
+
+    threshold = min(g + bound(s) for _, g, s, _ in starts)
+    while threshold < math.inf:
+        if upper_bound is not None and threshold >= upper_bound:
+            break
+        next_threshold = math.inf
+        # stack: (state, g, h, indeks kategori move terakhir)
+        stack = [(s, g, h, 0) for h, g, s, _ in reversed(starts)]
+
+        while stack:
+            if stats["nodes"] >= max_iter:
+                return _result(best, "partial", trace, stats)
+            if progress is not None and stats["nodes"] % PROGRESS_EVERY == 0:
+                if progress({"nodes": stats["nodes"], "best_h": best_h}) is False:
+                    return _result(best, "cancelled", trace, stats)
+
+            state, g, h, last = stack.pop()
+            f = g + bound(state)
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                continue
+            stats["nodes"] += 1
+
+            if h < best_h:
+                best, best_h = state, h
+                yield improvement("astar", best, best_h, stats)
+            if h == 0:
+                return _result(state, "success", trace, stats)
+
+            children = [
+                (ng + bound(nb), nb, ng, nh, order[cat])
+                for nb, cat, ng, nh, _ in expand(state, g)
+                if order[cat] >= last
+            ]
+            # f terkecil di-pop duluan
+            children.sort(key=lambda c: c[0], reverse=True)
+            stack.extend((nb, ng, nh, i) for _, nb, ng, nh, i in children)
+            stats["frontier_peak"] = max(stats["frontier_peak"], len(stack))
+
+        threshold = next_threshold
+
+    return _result(best, "partial" if best_h > 0 else "success", trace, stats)
+
+
+# ============================================================
+# Weighted A* (epsilon) + ronde anytime
+# ============================================================
+def _weighted_round(
+    starts,
+    expand,
+    w,
+    limit,
+    *,
+    max_iter,
+    progress,
+    trace,
+    stats,
+    bound,
+    best,
+    lattice,
+    memory,
+):
+    """
+    Satu ronde weighted A* pada f = g + w · lower_bound, hanya mencari
+    solusi dengan friksi < ``limit``.
+
+    Return ``(outcome, goal, cost, open_min)``; outcome "found" /
+    "exhausted" (tidak ada solusi < limit) / "partial" (max_iter) /
+    "cancelled". open_min = min g + lower_bound di frontier saat goal
+    ditemukan → batas bawah friksi optimum.
+    """
+    counter = itertools.count()
+    pq, best_g = [], {}
+    for h, g, s, code in starts:
+        if g + bound(s) < limit:
+            pq.append((g + w * bound(s), next(counter), s, g, h, code))
+            best_g[lattice.key(s, code)] = g
+    heapq.heapify(pq)
+
+    while pq:
+        if stats["nodes"] >= max_iter:
+            return "partial", None, None, None
+        if progress is not None and stats["nodes"] % PROGRESS_EVERY == 0:
+            if progress({"nodes": stats["nodes"], "best_h": best["h"]}) is False:
+                return "cancelled", None, None, None
+
+        _, _, state, g, h, code = heapq.heappop(pq)
+        if g > best_g[lattice.key(state, code)]:
+            continue  # entry basi, ada jalur lebih murah
+        stats["nodes"] += 1
+
+        if h < best["h"]:
+            best["h"], best["state"] = h, state
+        if h == 0:
+            open_min = min([g] + [e[3] + bound(e[2]) for e in pq])
+            return "found", state, g, open_min
+
+        for nb, _, ng, nh, ncode in expand(state, g, limit, code):
+            key = lattice.key(nb, ncode)
+            if ng >= best_g.get(key, math.inf):
+                continue
+            best_g[key] = ng
+            f = ng + w * bound(nb)
+            heapq.heappush(pq, (f, next(counter), nb, ng, nh, ncode))
+        stats["frontier_peak"] = max(stats["frontier_peak"], len(pq))
+        if memory.check(pq, len(best_g) * G_ENTRY_BYTES, trace, stats):
+            # tabel g hanya untuk frontier yang tersisa (juga saat tabel g
+            # sendiri ≥ cap, jadi tidak tumbuh tanpa batas)
+            best_g = {lattice.key(e[2], e[5]): e[3] for e in pq}
+
+    return "exhausted", None, None, None
+
+
+def _weighted(
+    starts,
+    expand,
+    *,
+    max_iter,
+    progress,
+    trace,
+    stats,
+    bound,
+    upper_bound,
+    epsilon,
+    deadline_ms,
+    lattice,
+    memory,
+    **_,
+):
+    t_end = None if deadline_ms is None else time.perf_counter() + deadline_ms / 1000
+    h0, _, s0, _ = min(starts, key=lambda s: s[0])
+    best = {"h": h0, "state": s0}
+
+    goal, cost = None, math.inf if upper_bound is None else upper_bound
+    stats.update({"cost": None, "suboptimality_bound": None, "rounds": 0})
+    status = "partial"
+
+    while True:
+        w = 1.0 + epsilon
+        stats["rounds"] += 1
+        outcome, found, found_cost, open_min = _weighted_round(
+            starts,
+            expand,
+            w,
+            cost,
+            max_iter=max_iter,
+            progress=progress,
+            trace=trace,
+            stats=stats,
+            bound=bound,
+            best=best,
+            lattice=lattice,
+            memory=memory,
+        )
+
+        if outcome == "cancelled":
+            status = "cancelled"
+            break
+        if outcome == "partial":
+            break
+        if outcome == "exhausted":
+            if goal is not None and not stats["degraded"]:
+                stats["suboptimality_bound"] = 1.0  # tidak ada yang < cost
+            break
+
+        goal, cost = found, found_cost
+        status = "success"
+        stats["cost"] = cost
+        if stats["degraded"]:
+            # frontier pernah dipangkas → open_min bukan batas bawah lagi
+            stats["suboptimality_bound"] = None
+        else:
+            stats["suboptimality_bound"] = (
+                min(w, max(cost / open_min, 1.0))
+                if open_min > 0
+                else (1.0 if cost == 0 else w)
+            )
+        yield improvement("astar", goal, cost, stats)
+
+        if t_end is None or stats["degraded"] or stats["suboptimality_bound"] <= 1.0:
+            break
+        if time.perf_counter() >= t_end or epsilon == 0:
+            break
+        epsilon = epsilon * EPSILON_DECAY
+        if epsilon < EPSILON_MIN:
+            epsilon = 0.0
+
+    if goal is None:
+        return _result(best["state"], status, trace, stats)
+    return _result(goal, status, trace, stats)
@@ -0,0 +1,293 @@
+# budget_optimizer/batch.py
+"""
+Batch Solver
+------------
+Menjalankan AIRouter.solve untuk file berisi banyak user (CSV / JSONL)
+tanpa Streamlit.
+
+Pipeline berbasis generator:
+  read_records → chunk → worker process → write (JSONL, incremental)
+
+- Memory flat: hanya ``window`` chunk yang in-flight, input dibaca streaming
+- Paralel lintas proses (ProcessPoolExecutor), urutan input opsional
+- Checkpoint berkala (<output>.ckpt) → run yang terputus bisa di-resume
+
+Format input:
+  JSONL: {"income": ..., "baseline": {...}, "target": ..., "delta": ...}
+  CSV  : kolom income,target,delta + kolom per kategori (kos, makan, ...)
+         atau satu kolom "baseline" berisi JSON object
+"""
+
+import csv
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .config import CATEGORIES, MINIMUMS
+
+DEFAULT_DELTA = 50000
+CHECKPOINT_EVERY = 1000  # record
+
+# key raw record untuk baris yang gagal di-parse (jadi record error)
+_READ_ERROR = "__read_error__"
+
+
+# ---------------------------------------------------------
+# 1. Reading (streaming)
+# ---------------------------------------------------------
+def _detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return "csv" if ext == ".csv" else "jsonl"
+
+
+def _normalize_record(raw: Dict[str, Any]) -> Dict[str, Any]:
+    if _READ_ERROR in raw:
+        raise ValueError(raw[_READ_ERROR])
+
+    baseline = raw.get("baseline")
+    if isinstance(baseline, str):
+        baseline = json.loads(baseline)
+    if baseline is None:
+        baseline = {cat: raw.get(cat) or 0 for cat in CATEGORIES}
+
+    return {
+        "income": int(float(raw["income"])),
+        "baseline": {k: int(float(v)) for k, v in baseline.items()},
+        "target": int(float(raw.get("target") or 0)),
+        "delta": int(float(raw.get("delta") or DEFAULT_DELTA)),
+    }
+
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield raw record (dict) satu per satu dari CSV / JSONL. Baris yang
+    tidak bisa di-parse tetap di-yield sebagai ``{_READ_ERROR: pesan}``
+    supaya index record berikutnya tidak bergeser dan batch jalan terus.
+    """
+    fmt = fmt or _detect_format(path)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    row = {
+                        _READ_ERROR: f"CSV tidak valid (baris {reader.line_num}): {e}"
+                    }
+                yield row
+        else:
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield {_READ_ERROR: f"JSON tidak valid (baris {lineno}): {e}"}
+
+
+def _chunks(iterable, size: int) -> Iterator[List]:
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ---------------------------------------------------------
+# 2. Worker (jalan di process pool)
+# ---------------------------------------------------------
+_ROUTER = None
+
+
+def _init_worker(router_kwargs: Dict[str, Any]):
+    global _ROUTER
+    from .genai.ai_router import AIRouter
+
+    _ROUTER = AIRouter(**router_kwargs)
+
+
+def _solve_one(index: int, raw: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        rec = _normalize_record(raw)
+        res = _ROUTER.solve(
+            rec["baseline"], rec["income"], MINIMUMS, rec["target"], rec["delta"]
+        )
+    except Exception as e:  # satu record rusak tidak boleh menghentikan batch
+        return {"index": index, "status": "error", "error": str(e)}
+
+    trace = res.get("trace") or []
+    return {
+        "index": index,
+        "status": res.get("status"),
+        "method": trace[-1].get("method") if trace else None,
+        "final_state": res.get("final_state"),
+        "notes": res.get("notes"),
+    }
+
+
+def _solve_chunk(chunk: List[Tuple[int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    return [_solve_one(index, raw) for index, raw in chunk]
+
+
+# ---------------------------------------------------------
+# 3. Checkpoint
+# ---------------------------------------------------------
+def _checkpoint_path(output: str) -> str:
+    return output + ".ckpt"
+
+
+def _load_checkpoint(path: str) -> int:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return int(json.load(f)["done"])
+    except (OSError, ValueError, KeyError):
+        return 0
+
+
+def _save_checkpoint(path: str, input_path: str, done: int):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"input": input_path, "done": done}, f)
+    os.replace(tmp, path)  # atomic
+
+
+def _written_after(output: str, watermark: int) -> set:
+    """Index >= watermark yang sudah ada di output (ditulis setelah checkpoint)."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                index = json.loads(line)["index"]
+            except (ValueError, KeyError):
+                continue  # baris terakhir bisa terpotong saat crash
+            if index >= watermark:
+                done.add(index)
+    return done
+
+
+def _terminate_partial_line(output: str):
+    """Baris terakhir yang terpotong (crash) ditutup supaya append tidak menempel."""
+    if not os.path.exists(output) or os.path.getsize(output) == 0:
+        return
+    with open(output, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+# ---------------------------------------------------------
+# 4. Main batch runner
+# ---------------------------------------------------------
+def _iter_results(tasks, workers, window, ordered, router_kwargs):
+    """
+    tasks: iterator (seq, chunk). Yield (seq, hasil chunk) dengan maksimal
+    ``window`` chunk in-flight sehingga input tidak pernah dibaca habis.
+    """
+    if workers <= 1:
+        _init_worker(router_kwargs)
+        for seq, chunk in tasks:
+            yield seq, _solve_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(router_kwargs,)
+    ) as pool:
+        pending = deque()
+        tasks = iter(tasks)
+
+        def fill():
+            for seq, chunk in itertools.islice(tasks, window - len(pending)):
+                pending.append((seq, pool.submit(_solve_chunk, chunk)))
+
+        fill()
+        while pending:
+            if ordered:
+                seq, fut = pending.popleft()
+                yield seq, fut.result()
+            else:
+                done, _ = wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                for item in [p for p in pending if p[1] in done]:
+                    pending.remove(item)
+                    yield item[0], item[1].result()
+            fill()
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    *,
+    fmt: Optional[str] = None,
+    workers: int = 1,
+    ordered: bool = True,
+    chunksize: int = 64,
+    window: Optional[int] = None,
+    resume: bool = False,
+    router_kwargs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """
+    Solve semua record di ``input_path`` dan tulis JSONL ke ``output_path``.
+
+    resume=True → lanjut dari checkpoint (record yang sudah ditulis di-skip,
+    output di-append). Return ringkasan {"processed", "skipped", "errors"}.
+    """
+    window = window or max(2, workers * 2)
+    router_kwargs = router_kwargs or {}
+    ckpt = _checkpoint_path(output_path)
+
+    watermark, already = 0, set()
+    if resume:
+        watermark = _load_checkpoint(ckpt)
+        already = _written_after(output_path, watermark)
+
+    records = (
+        (i, raw)
+        for i, raw in enumerate(read_records(input_path, fmt))
+        if i >= watermark and i not in already
+    )
+    tasks = enumerate(_chunks(records, chunksize))
+
+    stats = {"processed": 0, "skipped": watermark + len(already), "errors": 0}
+    # chunk seq -> index terakhir; untuk chunk yang selesai tapi belum
+    # bersambung dengan chunk sebelumnya (mode unordered)
+    completed, next_seq = {}, 0
+    since_ckpt = 0
+
+    if resume:
+        _terminate_partial_line(output_path)
+
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as out:
+        for seq, results in _iter_results(
+            tasks, workers, window, ordered, router_kwargs
+        ):
+            for row in results:
+                out.write(json.dumps(row) + "\n")
+                stats["errors"] += row["status"] == "error"
+            stats["processed"] += len(results)
+            since_ckpt += len(results)
+
+            # watermark maju hanya jika semua chunk sebelumnya sudah selesai
+            completed[seq] = results[-1]["index"]
+            while next_seq in completed:
+                watermark = completed.pop(next_seq) + 1
+                next_seq += 1
+
+            if since_ckpt >= CHECKPOINT_EVERY:
+                out.flush()
+                _save_checkpoint(ckpt, input_path, watermark)
+                since_ckpt = 0
+
+        out.flush()
+
+    _save_checkpoint(ckpt, input_path, watermark)
+    return stats
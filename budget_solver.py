@@ -1,9 +1,100 @@
 # budget_solver.py
 # Linear Programming-based Budget Optimizer (Option B: Output matches Solver Panel)
+#
+# Formulasi (L1 berbobot, exact sebagai LP):
+#
+#   min   Σ w_c · (d⁺_c + d⁻_c)                 w = BOBOT (friksi psikologis)
+#   s.t.  x_c − d⁺_c + d⁻_c = baseline_c         (d⁺/d⁻ = naik/turun dari baseline)
+#         Σ x_c ≤ income
+#         x_tabungan ≥ target
+#         min_c ≤ x_c ≤ max_c,   d⁺, d⁻ ≥ 0
+#
+# Solusi LP (kontinu) lalu dibulatkan ke grid ``delta`` relatif baseline
+# (grid yang sama dengan A*/Greedy/SA) dan diperbaiki feasibility-nya.
 
-from typing import Dict, Any
-import numpy as np
-from scipy.optimize import linprog
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+from .config import BOBOT
+
+# numpy / scipy sengaja TIDAK di-import di level modul: scipy.optimize
+# butuh ~200ms saat import, padahal solver ini hanya dipakai sesekali.
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+@lru_cache(maxsize=16)
+def _structure(n: int):
+    """
+    Bagian model yang hanya bergantung pada jumlah kategori (A_eq, baris
+    income di A_ub). Di-cache supaya re-solve saat target / income berubah
+    hanya membangun ulang rhs & bounds. Array dibuat read-only.
+    """
+    import numpy as np
+
+    A_eq = np.hstack([np.eye(n), -np.eye(n), np.eye(n)])
+    A_ub = np.concatenate([np.ones(n), np.zeros(2 * n)]).reshape(1, -1)
+    A_eq.setflags(write=False)
+    A_ub.setflags(write=False)
+    return A_eq, A_ub
+
+
+def round_to_grid(
+    solution: Dict[str, float],
+    baseline: Dict[str, int],
+    lower: Dict[str, int],
+    income: int,
+    delta: int,
+    weights: Dict[str, float],
+    upper: Optional[Dict[str, int]] = None,
+) -> Optional[Dict[str, int]]:
+    """
+    Bulatkan solusi LP ke grid ``baseline + k·delta`` lalu repair:
+      1. tiap kategori tidak boleh di bawah ``lower`` (min / target tabungan)
+      2. jika total > income → turunkan kategori dengan bobot termurah
+      3. tightening: geser kategori kembali mendekati baseline selama
+         tetap feasible (mengurangi friksi akibat pembulatan)
+
+    Return None jika tidak ada titik grid yang feasible.
+    """
+    upper = upper or {}
+    state, lo, hi = {}, {}, {}
+
+    for cat, b in baseline.items():
+        lo[cat] = b + _ceil_div(lower.get(cat, 0) - b, delta) * delta
+        hi[cat] = b + ((upper.get(cat, 10**15) - b) // delta) * delta
+        if lo[cat] > hi[cat]:
+            return None
+
+        k = round((solution[cat] - b) / delta)
+        state[cat] = min(max(b + k * delta, lo[cat]), hi[cat])
+
+    # 2. repair overspend — kategori termurah dulu
+    by_cost = sorted(state, key=lambda c: (weights.get(c, 1.0), -state[c]))
+    excess = sum(state.values()) - income
+    for cat in by_cost:
+        if excess <= 0:
+            break
+        steps = min(_ceil_div(excess, delta), (state[cat] - lo[cat]) // delta)
+        state[cat] -= steps * delta
+        excess -= steps * delta
+
+    if excess > 0:
+        return None
+
+    # 3. tightening — kategori termahal dulu
+    for cat in reversed(by_cost):
+        b = baseline[cat]
+        while state[cat] > b and state[cat] - delta >= lo[cat]:
+            state[cat] -= delta
+            excess -= delta
+        while state[cat] < b and excess + delta <= 0 and state[cat] + delta <= hi[cat]:
+            state[cat] += delta
+            excess += delta
+
+    return state
 
 
 class BudgetSolver:
@@ -15,6 +106,14 @@ class BudgetSolver:
     |     |— Final Budget
     |     |— Trace
     |     |— Constraints
+
+    data:
+      baseline     dict kategori -> nominal (wajib)
+      income       batas total (default: total baseline)
+      constraints  {kategori: {"min": .., "max": ..}}
+      target       target tabungan minimum (default 0)
+      delta        grid pembulatan (default 0 = tanpa pembulatan)
+      weights      bobot friksi per kategori (default config.BOBOT)
     """
 
     def __init__(self, data: Dict[str, Any]):
@@ -25,36 +124,48 @@ class BudgetSolver:
     # ---------------------------------------------------------
     # Build Constraints
     # ---------------------------------------------------------
-    def _build_constraints(self):
-        base = self.data["baseline"]
+    def _lower_bounds(self) -> Dict[str, float]:
         cons = self.data.get("constraints", {})
+        lower = {cat: cons.get(cat, {}).get("min", 0) for cat in self.categories}
 
-        mins = np.array(
-            [cons.get(cat, {}).get("min", 0) for cat in self.categories], dtype=float
-        )
+        target = self.data.get("target") or 0
+        if "tabungan" in lower:
+            lower["tabungan"] = max(lower["tabungan"], target)
+        return lower
 
-        maxs = np.array(
-            [cons.get(cat, {}).get("max", 1e12) for cat in self.categories], dtype=float
-        )
+    def _income(self) -> float:
+        return self.data.get("income", sum(self.data["baseline"].values()))
 
-        income = self.data.get("income", sum(base.values()))
+    def _build_constraints(self):
+        import numpy as np
 
-        A_eq = np.ones((1, self.n))
-        b_eq = np.array([income])
+        n = self.n
+        base = self.data["baseline"]
+        cons = self.data.get("constraints", {})
+        lower = self._lower_bounds()
 
-        bounds = [(mins[i], maxs[i]) for i in range(self.n)]
+        # variabel: [x (n), d_plus (n), d_minus (n)]
+        A_eq, A_ub = _structure(n)
+        b_eq = np.array([base[c] for c in self.categories], dtype=float)
+        b_ub = np.array([self._income()], dtype=float)
 
-        return A_eq, b_eq, bounds
+        bounds = [
+            (lower[cat], cons.get(cat, {}).get("max", None)) for cat in self.categories
+        ] + [(0, None)] * (2 * n)
+
+        return A_eq, b_eq, A_ub, b_ub, bounds
 
     # ---------------------------------------------------------
     # Objective Function
     # ---------------------------------------------------------
     def _objective(self):
-        base = self.data["baseline"]
-        base_arr = np.array([base[c] for c in self.categories], dtype=float)
+        import numpy as np
 
-        # LP cannot handle quadratic directly → approximate by linear bias
-        c = -2 * base_arr
+        weights = self.data.get("weights", BOBOT)
+        w = np.array([weights.get(c, 1.0) for c in self.categories], dtype=float)
+
+        # Jarak L1 berbobot dari baseline: w·(d⁺ + d⁻); x sendiri tidak berbiaya
+        c = np.concatenate([np.zeros(self.n), w, w])
 
         return c
 
@@ -62,34 +173,83 @@ class BudgetSolver:
     # Solve LP
     # ---------------------------------------------------------
     def solve(self) -> Dict[str, Any]:
-        A_eq, b_eq, bounds = self._build_constraints()
+        from scipy.optimize import linprog
+
+        A_eq, b_eq, A_ub, b_ub, bounds = self._build_constraints()
         c = self._objective()
 
-        result = linprog(c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method="highs")
+        result = linprog(
+            c,
+            A_ub=A_ub,
+            b_ub=b_ub,
+            A_eq=A_eq,
+            b_eq=b_eq,
+            bounds=bounds,
+            method="highs",
+        )
 
         if not result.success:
-            return {
-                "success": False,
-                "solver_panel": {
-                    "final_budget": {},
-                    "trace": {"status": result.message, "raw": str(result)},
-                    "constraints": self.data.get("constraints", {}),
-                },
-            }
+            return self._failed(result.message, str(result))
 
-        final_budget = {
-            cat: float(result.x[i]) for i, cat in enumerate(self.categories)
+        return self._package(result.x, float(result.fun), result.message, str(result))
+
+    # ---------------------------------------------------------
+    # Packaging (dipakai solve & solve_batch)
+    # ---------------------------------------------------------
+    def _failed(self, message, raw) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "solver_panel": {
+                "final_budget": {},
+                "trace": {"status": message, "raw": raw},
+                "constraints": self.data.get("constraints", {}),
+            },
         }
 
+    def _package(self, x, objective, message, raw) -> Dict[str, Any]:
+        lp_budget = {cat: float(x[i]) for i, cat in enumerate(self.categories)}
+
+        final_budget = lp_budget
+        delta = self.data.get("delta") or 0
+        if delta > 0:
+            cons = self.data.get("constraints", {})
+            final_budget = round_to_grid(
+                lp_budget,
+                self.data["baseline"],
+                self._lower_bounds(),
+                self._income(),
+                delta,
+                self.data.get("weights", BOBOT),
+                upper={
+                    cat: cons[cat]["max"]
+                    for cat in self.categories
+                    if "max" in cons.get(cat, {})
+                },
+            )
+
         trace = {
             "baseline": self.data["baseline"],
             "final": final_budget,
-            "status": result.message,
-            "raw": str(result),
+            "lp_solution": lp_budget,
+            "objective": objective,
+            "status": message,
+            "raw": raw,
         }
 
         constraints = self.data.get("constraints", {})
 
+        if final_budget is None:
+            # LP feasible tapi tidak ada titik grid delta yang feasible
+            trace["status"] = "No feasible point on the delta grid"
+            return {
+                "success": False,
+                "solver_panel": {
+                    "final_budget": {},
+                    "trace": trace,
+                    "constraints": constraints,
+                },
+            }
+
         return {
             "success": True,
             "solver_panel": {
@@ -99,5 +259,59 @@ class BudgetSolver:
             },
         }
 
+    # ---------------------------------------------------------
+    # Batch: N user dalam satu model block-diagonal
+    # ---------------------------------------------------------
+    @classmethod
+    def solve_batch(cls, datas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Solve banyak user dalam SATU panggilan HiGHS.
+
+        Constraint tiap user ditumpuk jadi matriks sparse block-diagonal
+        (problem antar user independen), objective & bounds di-concat, lalu
+        vektor solusi dipotong lagi per user. Overhead setup scipy/HiGHS
+        dibayar sekali, bukan N kali (cohort re-optimization malam hari).
+
+        Jika model gabungan infeasible (cukup satu user infeasible), fallback
+        ke solve per user supaya user lain tetap dapat hasil.
+        """
+        if not datas:
+            return []
+
+        from scipy import sparse
+        from scipy.optimize import linprog
+        import numpy as np
+
+        solvers = [cls(d) for d in datas]
+        blocks = [s._build_constraints() for s in solvers]
+
+        A_eq = sparse.block_diag([sparse.csr_matrix(b[0]) for b in blocks], "csr")
+        A_ub = sparse.block_diag([sparse.csr_matrix(b[2]) for b in blocks], "csr")
+        b_eq = np.concatenate([b[1] for b in blocks])
+        b_ub = np.concatenate([b[3] for b in blocks])
+        bounds = [bnd for b in blocks for bnd in b[4]]
+        objectives = [s._objective() for s in solvers]
+        c = np.concatenate(objectives)
+
+        result = linprog(
+            c,
+            A_ub=A_ub,
+            b_ub=b_ub,
+            A_eq=A_eq,
+            b_eq=b_eq,
+            bounds=bounds,
+            method="highs",
+        )
+
+        if not result.success:
+            return [s.solve() for s in solvers]
+
+        results, offset = [], 0
+        for s, c_i in zip(solvers, objectives):
+            x_i = result.x[offset : offset + len(c_i)]
+            offset += len(c_i)
+            results.append(s._package(x_i, float(c_i @ x_i), result.message, "batch"))
+        return results
+
 
 # End of file
@@ -1,8 +1,165 @@
 # budget_visualizer.py
 # Visualization module for Baseline Pie, Final Pie, and Before-After Comparison
+#
+# Rendering layer:
+# - Backend matplotlib dipaksa "Agg" (headless, tanpa GUI event loop)
+# - Hasil render (PNG/SVG bytes) di-cache berdasarkan data budget,
+#   jadi rerun Streamlit dengan data yang sama tidak menggambar ulang
+# - Setiap figure yang dibuat untuk cache langsung di-close (plt.close)
+#   supaya registry pyplot tidak tumbuh terus di proses long-running
+# - Spec Plotly untuk panel app.py juga di-cache dengan key yang sama
 
-import matplotlib.pyplot as plt
-from typing import Dict, Any
+import copy
+import io
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+# Jumlah chart (per jenis + data) yang disimpan di cache render
+RENDER_CACHE_SIZE = 128
+
+
+def _pyplot():
+    """Import matplotlib hanya saat chart benar-benar dibuat (backend Agg)."""
+    import matplotlib
+
+    if matplotlib.get_backend().lower() != "agg":
+        matplotlib.use("Agg", force=True)
+
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _budget_key(budget: Dict[str, Any]) -> Tuple[Tuple[str, float], ...]:
+    """Key hashable untuk cache; urutan kategori dipertahankan (urutan label)."""
+    return tuple((str(cat), float(amount)) for cat, amount in budget.items())
+
+
+# ---------------------------------------------------------
+# Drawing functions (dipakai BudgetVisualizer & cache)
+# ---------------------------------------------------------
+def _draw_pie(budget, title):
+    fig, ax = _pyplot().subplots(figsize=(6, 6))
+    ax.pie(list(budget.values()), labels=list(budget.keys()), autopct="%1.1f%%")
+    ax.set_title(title)
+    return fig
+
+
+def _draw_baseline_pie(baseline, final):
+    return _draw_pie(baseline, "Baseline Budget Distribution")
+
+
+def _draw_final_pie(baseline, final):
+    return _draw_pie(final, "Final Optimized Budget Distribution")
+
+
+def _draw_before_after(baseline, final):
+    categories = list(baseline.keys())
+    before = list(baseline.values())
+    after = [final[c] for c in categories]
+
+    x = range(len(categories))
+
+    fig, ax = _pyplot().subplots(figsize=(10, 5))
+    ax.bar(x, before, width=0.4, label="Baseline")
+    ax.bar([i + 0.4 for i in x], after, width=0.4, label="Final")
+
+    ax.set_xticks([i + 0.2 for i in x])
+    ax.set_xticklabels(categories, rotation=45)
+    ax.set_title("Before vs After Budget Comparison")
+    ax.legend()
+
+    return fig
+
+
+_DRAWERS = {
+    "baseline_pie": _draw_baseline_pie,
+    "final_pie": _draw_final_pie,
+    "before_after": _draw_before_after,
+}
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_cached(kind, baseline_key, final_key, fmt):
+    plt = _pyplot()
+    fig = _DRAWERS[kind](dict(baseline_key), dict(final_key))
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def render_chart(kind: str, baseline: Dict, final: Dict, fmt: str = "png") -> bytes:
+    """
+    Render chart ke bytes (png/svg) dengan cache.
+    kind: "baseline_pie" | "final_pie" | "before_after"
+    """
+    if kind not in _DRAWERS:
+        raise ValueError(f"Unknown chart kind: {kind}")
+    return _render_cached(kind, _budget_key(baseline), _budget_key(final), fmt)
+
+
+def render_cache_info():
+    """Statistik cache render (hits/misses/currsize)."""
+    return _render_cached.cache_info()
+
+
+# ---------------------------------------------------------
+# Plotly specs (panel interaktif di app.py)
+# ---------------------------------------------------------
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _plotly_pie_cached(final_key):
+    import plotly.express as px
+
+    # Hapus kategori yang nilainya 0 agar chart tidak penuh label kosong
+    items = [(cat, amount) for cat, amount in final_key if amount > 0]
+
+    fig = px.pie(
+        values=[amount for _, amount in items],
+        names=[cat for cat, _ in items],
+        hole=0.4,  # Donut chart
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+        title="Alokasi Anggaran Final",
+    )
+    fig.update_traces(
+        textposition="inside",
+        textinfo="percent+label",
+        hoverinfo="label+percent+value",
+    )
+    fig.update_layout(showlegend=False, margin=dict(t=40, b=0, l=0, r=0))
+    return fig.to_dict()
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _plotly_radar_cached(final_key):
+    import plotly.express as px
+
+    fig = px.line_polar(
+        r=[amount for _, amount in final_key],
+        theta=[cat for cat, _ in final_key],
+        line_close=True,  # Menutup garis loop (jaring laba-laba)
+        title="Peta Keseimbangan Anggaran",
+    )
+    fig.update_traces(fill="toself", line_color="#00CC96")
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, showticklabels=False)),
+        margin=dict(t=40, b=20, l=40, r=40),
+    )
+    return fig.to_dict()
+
+
+# Spec di cache dipakai bersama semua session → tiap caller dapat salinan,
+# supaya mutasi figure (update_layout, dll.) tidak mengotori cache.
+def plotly_pie_spec(final_budget: Dict) -> Dict:
+    """Spec donut chart alokasi final (dict Plotly, di-cache per data)."""
+    return copy.deepcopy(_plotly_pie_cached(_budget_key(final_budget)))
+
+
+def plotly_radar_spec(final_budget: Dict) -> Dict:
+    """Spec radar chart keseimbangan anggaran (dict Plotly, di-cache per data)."""
+    return copy.deepcopy(_plotly_radar_cached(_budget_key(final_budget)))
 
 
 class BudgetVisualizer:
@@ -14,6 +171,9 @@ class BudgetVisualizer:
     |     |— Before-After Comparison (Bar Chart)
 
     Output: Matplotlib figures (can be rendered inside Streamlit or saved)
+
+    plot_*   → figure baru; pemanggil WAJIB plt.close(fig) setelah dipakai
+    render() → PNG/SVG bytes dari cache, figure sudah di-close
     """
 
     def __init__(self, solver_output: Dict[str, Any]):
@@ -25,46 +185,25 @@ class BudgetVisualizer:
     # Baseline Pie Chart
     # ---------------------------------------------------------
     def plot_baseline_pie(self):
-        labels = list(self.baseline.keys())
-        amounts = list(self.baseline.values())
-
-        fig, ax = plt.subplots(figsize=(6, 6))
-        ax.pie(amounts, labels=labels, autopct="%1.1f%%")
-        ax.set_title("Baseline Budget Distribution")
-        return fig
+        return _draw_baseline_pie(self.baseline, self.final)
 
     # ---------------------------------------------------------
     # Final Pie Chart
     # ---------------------------------------------------------
     def plot_final_pie(self):
-        labels = list(self.final.keys())
-        amounts = list(self.final.values())
-
-        fig, ax = plt.subplots(figsize=(6, 6))
-        ax.pie(amounts, labels=labels, autopct="%1.1f%%")
-        ax.set_title("Final Optimized Budget Distribution")
-        return fig
+        return _draw_final_pie(self.baseline, self.final)
 
     # ---------------------------------------------------------
     # Before/After Comparison (Bar Chart)
     # ---------------------------------------------------------
     def plot_before_after(self):
-        categories = list(self.baseline.keys())
-        before = list(self.baseline.values())
-        after = [self.final[c] for c in categories]
-
-        x = range(len(categories))
+        return _draw_before_after(self.baseline, self.final)
 
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.bar(x, before, width=0.4, label="Baseline")
-        ax.bar([i + 0.4 for i in x], after, width=0.4, label="Final")
-
-        ax.set_xticks([i + 0.2 for i in x])
-        ax.set_xticklabels(categories, rotation=45)
-        ax.set_title("Before vs After Budget Comparison")
-        ax.legend()
-
-        return fig
+    # ---------------------------------------------------------
+    # Cached render (bytes)
+    # ---------------------------------------------------------
+    def render(self, kind: str, fmt: str = "png") -> bytes:
+        return render_chart(kind, self.baseline, self.final, fmt)
 
 
 # End of file
@@ -0,0 +1,135 @@
+# budget_optimizer/dp_solver.py
+"""
+DP Solver (exact di grid delta)
+-------------------------------
+Goal yang sama dengan A*/Greedy/Tabu/SA (dan tier LP di router), tapi
+langsung di grid ``baseline + k·delta``:
+
+    min   Σ w_c · |k_c| · delta
+    s.t.  Σ k_c ≤ K = ⌊(income − Σ baseline) / delta⌋
+          lo_c ≤ k_c ≤ hi_c      (minimum, maximum)
+          tabungan = target      (jika target diisi — heuristic solver
+                                  memberi penalti |target − tabungan|)
+
+Ini bounded integer knapsack: kategori diproses satu per satu dengan tabel
+``cost[s]`` = friksi minimum untuk Σ (k_c − lo_c) = s, s = 0..S. Satu baris
+NumPy per kategori plus matriks pilihan untuk backtrack (memori O(n · S),
+S ≈ (income − Σ baseline) / delta). k_c > max(lo_c, 0) selalu didominasi
+(menambah friksi dan memakai budget), jadi pilihan per kategori hanya
+lo_c..max(lo_c, 0) — runtime O(S · Σ max(−lo_c, 0)), bukan O(n · S²).
+Hasilnya optimum global di grid — deterministik, dan dipakai sebagai
+oracle untuk solver heuristik.
+"""
+
+from typing import Dict, Optional
+
+from .config import BOBOT
+from .transfer_planner import plan_between
+
+# Batas panjang tabel (S + 1). Di atas ini DP dilewati (delta terlalu kecil
+# relatif ke income): matriks pilihan O(n · S) tidak lagi "murah".
+DP_MAX_STATES = 20000
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def _failed(status, trace):
+    return {
+        "final_state": None,
+        "method": "dp",
+        "status": status,
+        "trace": trace,
+        "cost": None,
+        "moves": [],
+    }
+
+
+def dp_optimize(
+    init_state: Dict[str, int],
+    income: int,
+    minimums: Dict[str, int],
+    target: Optional[int] = None,
+    delta: int = 50000,
+    weights: Optional[Dict[str, float]] = None,
+    maximums: Optional[Dict[str, int]] = None,
+    max_states: int = DP_MAX_STATES,
+):
+    """
+    Alokasi friksi minimum di grid delta.
+
+    Return format sama dengan solver lain + "cost" (Σ w·|x − baseline|) dan
+    "moves" (List[Action] dari ``plan_between``). status:
+      "success"   — optimum ditemukan
+      "failed"    — tidak ada titik grid yang feasible
+      "too_large" — tabel > ``max_states`` (pakai solver lain)
+    """
+    import numpy as np
+
+    w = BOBOT if weights is None else weights
+    maximums = maximums or {}
+
+    state = dict(init_state)
+    if "tabungan" not in state:
+        state["tabungan"] = 0
+    cats = list(state)
+
+    lo, hi = [], []
+    for cat in cats:
+        floor = minimums.get(cat, 0)
+        ceiling = maximums.get(cat)
+        if cat == "tabungan" and target:
+            # tabungan tepat di target (target di luar grid → failed)
+            floor = max(floor, target)
+            ceiling = target if ceiling is None else min(ceiling, target)
+        lo.append(_ceil_div(floor - state[cat], delta))
+        hi.append(None if ceiling is None else (ceiling - state[cat]) // delta)
+
+    budget = (income - sum(state.values())) // delta  # Σ k_c ≤ budget
+    S = budget - sum(lo)
+    if S < 0 or any(h is not None and h < l for l, h in zip(lo, hi)):
+        return _failed("failed", [])
+    if S + 1 > max_states:
+        return _failed("too_large", [{"states": S + 1, "max_states": max_states}])
+
+    # cost[s]: friksi minimum kategori yang sudah diproses, Σ (k − lo) = s
+    cost = np.full(S + 1, np.inf)
+    cost[0] = 0.0
+    choice = np.zeros((len(cats), S + 1), dtype=np.int64)
+
+    for i, cat in enumerate(cats):
+        unit = w.get(cat, 1.0) * delta
+        # k > max(lo, 0) didominasi: friksi naik, budget terpakai
+        span = min(max(-lo[i], 0), S)
+        if hi[i] is not None:
+            span = min(span, hi[i] - lo[i])
+
+        new = np.full(S + 1, np.inf)
+        pick = choice[i]
+        for j in range(span + 1):
+            cand = cost[: S + 1 - j] + unit * abs(lo[i] + j)
+            better = cand < new[j:]
+            new[j:][better] = cand[better]
+            pick[j:][better] = j
+        cost = new
+
+    s = int(np.argmin(cost))  # seri → total spend terkecil
+    if not np.isfinite(cost[s]):
+        return _failed("failed", [])
+
+    final = {}
+    for i in reversed(range(len(cats))):
+        j = int(choice[i, s])
+        final[cats[i]] = state[cats[i]] + (lo[i] + j) * delta
+        s -= j
+    final = {cat: final[cat] for cat in cats}
+
+    return {
+        "final_state": final,
+        "method": "dp",
+        "status": "success",
+        "trace": [],
+        "cost": sum(w.get(c, 1.0) * abs(final[c] - state[c]) for c in cats),
+        "moves": plan_between(state, final, w),
+    }
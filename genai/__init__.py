@@ -0,0 +1,36 @@
+# budget_optimizer/genai/__init__.py
+"""
+Gen-AI layer (router, fallback chain, validator, LLM client).
+
+Sama seperti package utama, simbol di-load secara lazy supaya
+``import budget_optimizer.genai`` tidak ikut memuat ``requests``.
+"""
+
+import importlib
+
+_LAZY_ATTRS = {
+    "AIRouter": ".ai_router",
+    "run_fallback_chain": ".fallback_solver",
+    "validate_final_state": ".validator",
+    "generate_advice": ".advisor",
+    "interpret_preferences": ".preference_ai",
+    "generate_smart_baseline": ".preference_ai",
+    "llm_text": ".llm_client",
+    "llm_json": ".llm_client",
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
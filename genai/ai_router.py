@@ -3,47 +3,229 @@
 AI Router
 ---------
 Mengatur jalur solver:
-A* → Greedy → SA → Gen-AI Fallback
+LP (exact) → DP (exact di grid) → A* → Greedy → Tabu → SA → Gen-AI Fallback
+
+``solve`` mengembalikan hasil akhir; ``solve_stream`` adalah versi anytime
+yang me-yield setiap solusi yang lebih baik selama chain berjalan.
 """
 
+import math
 from typing import Dict, Any
 
-from budget_optimizer.astar import astar_search
-from budget_optimizer.greedy import greedy_optimize
-from budget_optimizer.simulated_annealing import simulated_annealing
+from budget_optimizer.astar import BEAM_WIDTH, astar_iter, friction
+from budget_optimizer.dp_solver import dp_optimize
+from budget_optimizer.greedy import greedy_iter
+from budget_optimizer.simulated_annealing import (
+    IncrementalScore,
+    multi_start_sa,
+    simulated_annealing_iter,
+)
+from budget_optimizer.tabu_search import tabu_search_iter
+from budget_optimizer.transfer_planner import plan_between
+from budget_optimizer.utils import drain
 from .fallback_solver import run_fallback_chain
 from .validator import validate_final_state
 
+# SA tier: schedule adaptive, boleh reheat sekian kali sebelum berhenti
+SA_REHEATS = 4
+
+# Batas perkiraan memori A* per request (byte); lewat dari ini frontier
+# dipangkas ke beam (lihat ``astar_search(memory_cap=...)``)
+ASTAR_MEMORY_CAP = 64 * 2**20
+
 
 class AIRouter:
-    def __init__(self, *, timeout_ms=4000, max_nodes=60000):
+    def __init__(
+        self,
+        *,
+        timeout_ms=4000,
+        max_nodes=60000,
+        sa_seeds=None,
+        sa_workers=1,
+        astar_mode="astar",
+        beam_width=BEAM_WIDTH,
+        astar_epsilon=None,
+        astar_deadline_ms=None,
+        astar_memory_cap=ASTAR_MEMORY_CAP,
+        use_dp=True,
+    ):
+        """
+        use_dp:
+            tier DP (``dp_solver``) setelah LP: optimum exact di grid delta
+            tanpa scipy. False → langsung ke tier heuristik.
+        astar_mode:
+            mode pencarian tier A* ("astar" | "beam" | "ida", lihat
+            ``astar_search``). "beam" / "ida" memberi peak memory tetap per
+            request — dipakai saat banyak solve berjalan bersamaan.
+        astar_epsilon / astar_deadline_ms:
+            weighted A* (``epsilon`` / ``deadline_ms`` di ``astar_search``):
+            friksi ≤ (1 + epsilon) × optimum, latensi lebih bisa ditebak.
+            Bound yang dicapai ikut di detail tier ("suboptimality_bound").
+        astar_memory_cap:
+            batas memori A* per request (byte, None = tanpa batas). Satu
+            request berat tidak bisa menghabiskan RAM worker bersama; jumlah
+            degradasi ke beam ada di detail tier ("degraded").
+        sa_seeds:
+            None → satu chain SA (bisa di-cancel via progress). List seed →
+            multi-start SA, satu chain per seed, hasil reproducible.
+        sa_workers:
+            jumlah proses untuk multi-start (1 = serial di proses ini).
+        """
         self.timeout_ms = timeout_ms
         self.max_nodes = max_nodes
+        self.sa_seeds = list(sa_seeds) if sa_seeds is not None else None
+        self.sa_workers = sa_workers
+        self.astar_mode = astar_mode
+        self.beam_width = beam_width
+        self.astar_epsilon = astar_epsilon
+        self.astar_deadline_ms = astar_deadline_ms
+        self.astar_memory_cap = astar_memory_cap
+        self.use_dp = use_dp
 
     # ---------------------------------------------------------
     # uniform packaging
     # ---------------------------------------------------------
-    def _pkg(self, *, method, status, final_state=None, plan=None, detail=None):
+    def _pkg(
+        self,
+        *,
+        method,
+        status,
+        final_state=None,
+        plan=None,
+        detail=None,
+        best_state=None,
+    ):
+        # best_state: state terbaik yang dicapai tier yang gagal (partial),
+        # dipakai sebagai titik awal tier berikutnya
         return {
             "method": method,
             "status": status,
             "final_state": final_state,
             "plan": plan,
             "detail": detail,
+            "best_state": best_state,
         }
 
+    # ---------------------------------------------------------
+    # TRY LP (exact tier)
+    # ---------------------------------------------------------
+    def try_lp(self, state, income, minimums, target, delta):
+        from budget_optimizer.budget_solver import BudgetSolver
+
+        # sama seperti A* / DP: kategori tabungan harus ada, kalau tidak
+        # target (batas bawah tabungan) ikut hilang dari LP
+        baseline = dict(state)
+        baseline.setdefault("tabungan", 0)
+
+        constraints = {cat: {"min": minv} for cat, minv in minimums.items()}
+        if target:
+            # goal semua tier: tabungan tepat di target (BudgetSolver sendiri
+            # hanya memberi batas bawah) → batas atas = target
+            constraints["tabungan"] = dict(constraints.get("tabungan", {}), max=target)
+
+        data = {
+            "baseline": baseline,
+            "income": income,
+            "constraints": constraints,
+            "target": target or 0,
+            "delta": delta,
+        }
+
+        try:
+            res = BudgetSolver(data).solve()
+        except ImportError:
+            # scipy tidak ter-install → tier dilewati, chain lanjut ke A*
+            return self._pkg(method="LP (HiGHS)", status="unavailable")
+
+        panel = res["solver_panel"]
+        if res["success"]:
+            return self._pkg(
+                method="LP (HiGHS)",
+                status="success",
+                # delta=0 → solusi LP kontinu (float); dibulatkan ke bawah
+                # (toleransi float) supaya tetap ≥ minimum dan ≤ income,
+                # dan bertipe int seperti tier lain
+                final_state={
+                    cat: math.floor(val + 1e-6)
+                    for cat, val in panel["final_budget"].items()
+                },
+                plan=None,
+                detail={
+                    "objective": panel["trace"]["objective"],
+                    "status": panel["trace"]["status"],
+                },
+            )
+
+        return self._pkg(
+            method="LP (HiGHS)",
+            status="failed",
+            final_state=None,
+            plan=None,
+            detail={"status": panel["trace"]["status"]},
+        )
+
+    # ---------------------------------------------------------
+    # TRY DP (exact di grid delta)
+    # ---------------------------------------------------------
+    def try_dp(self, state, income, minimums, target, delta):
+        if not delta:
+            return self._pkg(method="DP (grid)", status="unavailable")
+
+        try:
+            res = dp_optimize(state, income, minimums, target, delta)
+        except ImportError:
+            # numpy tidak ter-install → tier dilewati
+            return self._pkg(method="DP (grid)", status="unavailable")
+
+        if res["status"] == "success":
+            return self._pkg(
+                method="DP (grid)",
+                status="success",
+                final_state=res["final_state"],
+                plan=res["moves"],
+                detail={"cost": res["cost"]},
+            )
+
+        # "failed" (tidak ada titik grid feasible) / "too_large"
+        return self._pkg(
+            method="DP (grid)",
+            status=res["status"],
+            detail=res["trace"] or None,
+        )
+
     # ---------------------------------------------------------
     # TRY A*
     # ---------------------------------------------------------
-    def try_astar(self, state, income, minimums, target, delta):
+    def try_astar(self, *args, **kwargs):
+        return drain(self.iter_astar(*args, **kwargs))
+
+    def iter_astar(
+        self,
+        state,
+        income,
+        minimums,
+        target,
+        delta,
+        progress=None,
+        warm_start=None,
+        upper_bound=None,
+    ):
         # Sesuaikan parameter dengan definisi di astar.py
-        res = astar_search(
+        res = yield from astar_iter(
             init_state=state,
             income=income,
             minimums=minimums,
             target=target,
             delta=delta,
             max_iter=self.max_nodes,
+            progress=progress,
+            warm_start=warm_start,
+            upper_bound=upper_bound,
+            mode=self.astar_mode,
+            beam_width=self.beam_width,
+            epsilon=self.astar_epsilon,
+            deadline_ms=self.astar_deadline_ms,
+            memory_cap=self.astar_memory_cap,
         )
 
         # FIX: Hapus akses ke res["plan"] dan res["metrics"]
@@ -55,7 +237,7 @@ class AIRouter:
                 status="success",
                 final_state=res["final_state"],
                 plan=None,  # astar.py tidak return 'plan'
-                detail=res.get("trace"),  # Gunakan 'trace' sebagai detail
+                detail=res.get("stats"),  # nodes expanded / pruned
             )
 
         return self._pkg(
@@ -63,15 +245,23 @@ class AIRouter:
             status=res["status"],
             final_state=None,
             plan=None,
-            detail=res.get("trace"),  # Gunakan 'trace' sebagai detail
+            detail=res.get("stats"),
+            best_state=res["final_state"],
         )
 
     # ---------------------------------------------------------
     # TRY GREEDY
     # ---------------------------------------------------------
-    def try_greedy(self, state, income, minimums, target, delta):  # Tambah minimums
+    def try_greedy(self, *args, **kwargs):
+        return drain(self.iter_greedy(*args, **kwargs))
+
+    def iter_greedy(
+        self, state, income, minimums, target, delta, warm_start=None
+    ):  # Tambah minimums
         # Urutan argumen HARUS: state, income, minimums, target, delta
-        g = greedy_optimize(state, income, minimums, target, delta)
+        g = yield from greedy_iter(
+            state, income, minimums, target, delta, warm_start=warm_start
+        )
 
         if g["status"] == "success":
             return self._pkg(
@@ -86,14 +276,85 @@ class AIRouter:
             status="failed",
             final_state=None,
             plan=None,
+            best_state=g["final_state"],
+        )
+
+    # ---------------------------------------------------------
+    # TRY TABU (deterministik)
+    # ---------------------------------------------------------
+    def try_tabu(self, *args, **kwargs):
+        return drain(self.iter_tabu(*args, **kwargs))
+
+    def iter_tabu(
+        self, state, income, minimums, target, delta, progress=None, warm_start=None
+    ):
+        tabu = yield from tabu_search_iter(
+            state,
+            income,
+            minimums,
+            target,
+            delta,
+            progress=progress,
+            warm_start=warm_start,
+        )
+
+        if tabu["status"] == "success":
+            return self._pkg(
+                method="Tabu Search",
+                status="success",
+                final_state=tabu["final_state"],
+                plan=None,
+                detail=tabu["stats"],
+            )
+
+        return self._pkg(
+            method="Tabu Search",
+            status="cancelled" if tabu["status"] == "cancelled" else "failed",
+            final_state=None,
+            plan=None,
+            detail=tabu["stats"],
+            best_state=tabu["final_state"],
         )
 
     # ---------------------------------------------------------
     # TRY SA
     # ---------------------------------------------------------
-    def try_sa(self, state, income, minimums, target, delta):  # Tambah minimums
+    def try_sa(self, *args, **kwargs):
+        return drain(self.iter_sa(*args, **kwargs))
+
+    def iter_sa(
+        self, state, income, minimums, target, delta, progress=None, warm_start=None
+    ):
         # Urutan argumen HARUS: state, income, minimums, target, delta
-        sa = simulated_annealing(state, income, minimums, target, delta)
+        if self.sa_seeds:
+            sa = multi_start_sa(
+                state,
+                income,
+                minimums,
+                target,
+                delta,
+                seeds=self.sa_seeds,
+                workers=self.sa_workers,
+                warm_start=warm_start,
+                move_set="mixed",
+                schedule="adaptive",
+                reheats=SA_REHEATS,
+            )
+            detail = {"seed": sa["seed"], "chains": sa["chains"]}
+        else:
+            sa = yield from simulated_annealing_iter(
+                state,
+                income,
+                minimums,
+                target,
+                delta,
+                progress=progress,
+                warm_start=warm_start,
+                move_set="mixed",
+                schedule="adaptive",
+                reheats=SA_REHEATS,
+            )
+            detail = sa["stats"]
 
         if sa["status"] == "success":
             return self._pkg(
@@ -101,57 +362,293 @@ class AIRouter:
                 status="success",
                 final_state=sa["final_state"],
                 plan=None,
+                detail=detail,
             )
 
         return self._pkg(
             method="Simulated Annealing",
-            status="failed",
+            status="cancelled" if sa["status"] == "cancelled" else "failed",
             final_state=None,
             plan=None,
         )
 
+    # ---------------------------------------------------------
+    # hasil akhir: validasi + rencana transfer (explainable plan)
+    # ---------------------------------------------------------
+    @staticmethod
+    def _finish(tier, state, minimums, trace):
+        validated = validate_final_state(tier["final_state"], minimums)
+        plan = plan_between(state, validated["final_state"])
+        return validated | {"plan": plan, "trace": trace}
+
+    # ---------------------------------------------------------
+    # progress helpers (dipakai job runner UI)
+    # ---------------------------------------------------------
+    @staticmethod
+    def _tier_progress(progress, tier):
+        """Bungkus callback progress supaya setiap laporan membawa nama tier."""
+        if progress is None:
+            return None
+
+        def report(info):
+            return progress({"tier": tier, **info})
+
+        return report
+
+    @staticmethod
+    def _best_seed(candidates, income, minimums, target):
+        """State kandidat dengan skor objective SA terendah (None = dilewati)."""
+        scored = [
+            (IncrementalScore(dict(c), income, minimums, target).score, i, c)
+            for i, c in enumerate(candidates)
+            if c
+        ]
+        return min(scored)[2] if scored else None
+
+    @staticmethod
+    def _cancelled(progress, tier, trace):
+        if progress is None or progress({"tier": tier}) is not False:
+            return None
+        return {"status": "cancelled", "final_state": None, "trace": trace}
+
     # ---------------------------------------------------------
     # MAIN: RUN CHAIN
     # ---------------------------------------------------------
-    def solve(self, state, income, minimums, target, delta):
+    def solve(
+        self, state, income, minimums, target, delta, progress=None, warm_start=None
+    ):
+        """
+        progress:
+            callable opsional ``progress(info)``; ``info`` selalu berisi
+            "tier" plus statistik solver (nodes / best_h / steps).
+            Return ``False`` untuk membatalkan chain.
+        warm_start:
+            final_state dari solve sebelumnya (baseline sama, target / income
+            sedikit berubah). Diabaikan jika kategorinya tidak sama dengan
+            ``state``; selain itu caller tidak perlu menyaring — perubahan
+            income / target ditangani solver. Hanya dipakai tier heuristik: A* dan Greedy
+            di-seed dari sini, Tabu / SA memulai dari sini. Tier exact (LP,
+            DP) menghitung optimum langsung dari ``state`` — warm_start tidak
+            mengubah hasilnya, jadi baru berpengaruh jika tier exact gagal /
+            tidak tersedia. Rencana transfer tetap dihitung dari ``state``.
+
+        Antar tier: greedy (closed-form, murah) dihitung di depan sebagai
+        incumbent — friksinya jadi upper bound pruning A*, jadi A* hanya
+        menelusuri jalur yang bisa lebih murah dari greedy. State terbaik
+        A* / greedy diteruskan ke Tabu (deterministik), lalu ke SA sebagai
+        titik awal, jadi keduanya memperhalus hasil itu alih-alih mulai lagi
+        dari baseline.
+        """
+        return drain(
+            self._chain(state, income, minimums, target, delta, progress, warm_start)
+        )
+
+    def solve_stream(
+        self, state, income, minimums, target, delta, progress=None, warm_start=None
+    ):
+        """
+        Versi anytime ``solve`` (generator). Yield event:
+
+          {"event": "improvement", "tier", "final_state", "score", "stats"}
+              setiap solusi yang strictly lebih baik dari sebelumnya, diukur
+              dengan objective SA (``IncrementalScore``, 0 = semua minimum,
+              income, dan target terpenuhi). Yang pertama datang dari greedy
+              dalam hitungan milidetik.
+          {"event": "result", "result": ...}
+              terakhir; isinya sama dengan return ``solve``.
+
+        Consumer boleh berhenti kapan saja (break / ``close()``); solver
+        berhenti di yield berikutnya.
+        """
+        result = yield from self._chain(
+            state, income, minimums, target, delta, progress, warm_start
+        )
+        yield {"event": "result", "result": result}
+
+    def _chain(self, state, income, minimums, target, delta, progress, warm_start):
+        """Chain tier; yield event improvement, return hasil akhir ``solve``."""
+        # semua tier (dan plan_between di _finish) butuh kategori tabungan
+        state = dict(state)
+        state.setdefault("tabungan", 0)
+
+        # warm start dari baseline dengan kategori lain tidak bisa dipakai;
+        # income / target boleh berubah (tier heuristik memperbaikinya)
+        if warm_start is not None:
+            warm_start = dict(warm_start)
+            warm_start.setdefault("tabungan", 0)
+            if set(warm_start) != set(state):
+                warm_start = None
+
         trace = []
+        best = {"score": None}
+
+        def offer(tier, final_state, stats=None):
+            if not final_state:
+                return
+            score = IncrementalScore(dict(final_state), income, minimums, target).score
+            if best["score"] is None or score < best["score"]:
+                best["score"] = score
+                yield {
+                    "event": "improvement",
+                    "tier": tier,
+                    "final_state": dict(final_state),
+                    "score": score,
+                    "stats": stats,
+                }
+
+        def relay(tier, gen):
+            """Teruskan improvement solver anytime; return result tier-nya."""
+            while True:
+                try:
+                    imp = next(gen)
+                except StopIteration as stop:
+                    res = stop.value
+                    break
+                yield from offer(tier, imp["final_state"], imp["stats"])
+            yield from offer(tier, res["final_state"] or res["best_state"])
+            return res
+
+        # ==============================
+        # 0. LP (exact, < 1 ms untuk 7 kategori)
+        # ==============================
+        cancelled = self._cancelled(progress, "LP (HiGHS)", trace)
+        if cancelled:
+            return cancelled
+
+        lp = self.try_lp(state, income, minimums, target, delta)
+        trace.append(lp)
+
+        if lp["status"] == "success":
+            yield from offer(lp["method"], lp["final_state"], lp["detail"])
+            return self._finish(lp, state, minimums, trace)
+
+        # ==============================
+        # 0b. DP (exact di grid, tanpa scipy)
+        # ==============================
+        if self.use_dp:
+            dp = self.try_dp(state, income, minimums, target, delta)
+            trace.append(dp)
+
+            if dp["status"] == "success":
+                yield from offer(dp["method"], dp["final_state"], dp["detail"])
+                return self._finish(dp, state, minimums, trace)
+
+        # incumbent greedy (dipakai A* sebagai upper bound, trace di tier 2);
+        # cek cancel sebelum greedy jalan, bukan setelah A*
+        cancelled = self._cancelled(progress, "Greedy", trace)
+        if cancelled:
+            return cancelled
+
+        greedy = yield from relay(
+            "Greedy",
+            self.iter_greedy(
+                state, income, minimums, target, delta, warm_start=warm_start
+            ),
+        )
+        incumbent = greedy["final_state"] or greedy["best_state"]
+        upper_bound = (
+            friction(state, incumbent) if greedy["status"] == "success" else None
+        )
 
         # ==============================
         # 1. A*
         # ==============================
-        a_star = self.try_astar(state, income, minimums, target, delta)
+        a_star = yield from relay(
+            "A* Search",
+            self.iter_astar(
+                state,
+                income,
+                minimums,
+                target,
+                delta,
+                progress=self._tier_progress(progress, "A* Search"),
+                warm_start=warm_start,
+                upper_bound=upper_bound,
+            ),
+        )
         trace.append(a_star)
 
+        if a_star["status"] == "cancelled":
+            return {"status": "cancelled", "final_state": None, "trace": trace}
+
         if a_star["status"] == "success":
-            validated = validate_final_state(a_star["final_state"], minimums)
-            return validated | {"trace": trace}
+            return self._finish(a_star, state, minimums, trace)
 
         # ==============================
         # 2. GREEDY
         # ==============================
-        # FIX: Pass minimums ke try_greedy
-        greedy = self.try_greedy(state, income, minimums, target, delta)
+        # hasil greedy sudah dihitung di depan (incumbent)
         trace.append(greedy)
 
         if greedy["status"] == "success":
-            validated = validate_final_state(greedy["final_state"], minimums)
-            return validated | {"trace": trace}
+            return self._finish(greedy, state, minimums, trace)
+
+        # ==============================
+        # 3. TABU (deterministik, dari state terbaik sejauh ini)
+        # ==============================
+        tabu = yield from relay(
+            "Tabu Search",
+            self.iter_tabu(
+                state,
+                income,
+                minimums,
+                target,
+                delta,
+                progress=self._tier_progress(progress, "Tabu Search"),
+                warm_start=self._best_seed(
+                    [warm_start, a_star["best_state"], incumbent],
+                    income,
+                    minimums,
+                    target,
+                ),
+            ),
+        )
+        trace.append(tabu)
+
+        if tabu["status"] == "cancelled":
+            return {"status": "cancelled", "final_state": None, "trace": trace}
+
+        if tabu["status"] == "success":
+            return self._finish(tabu, state, minimums, trace)
 
         # ==============================
-        # 3. SA
+        # 4. SA
         # ==============================
         # FIX: Pass minimums ke try_sa
-        sa = self.try_sa(state, income, minimums, target, delta)
+        sa = yield from relay(
+            "Simulated Annealing",
+            self.iter_sa(
+                state,
+                income,
+                minimums,
+                target,
+                delta,
+                progress=self._tier_progress(progress, "Simulated Annealing"),
+                warm_start=self._best_seed(
+                    [warm_start, a_star["best_state"], incumbent, tabu["best_state"]],
+                    income,
+                    minimums,
+                    target,
+                ),
+            ),
+        )
         trace.append(sa)
 
+        if sa["status"] == "cancelled":
+            return {"status": "cancelled", "final_state": None, "trace": trace}
+
         if sa["status"] == "success":
-            validated = validate_final_state(sa["final_state"], minimums)
-            return validated | {"trace": trace}
+            return self._finish(sa, state, minimums, trace)
 
         # ==============================
-        # 4. Fallback
+        # 5. Fallback
         # ==============================
+        cancelled = self._cancelled(progress, "Fallback", trace)
+        if cancelled:
+            return cancelled
+
         fb = run_fallback_chain(state, income, minimums, target, delta)
         trace.append(fb)
+        yield from offer("Fallback", fb.get("final_state"))
 
         return fb | {"trace": trace}
@@ -14,7 +14,6 @@ FITUR:
 
 import json
 import time
-import requests
 from typing import Dict, Any, Optional
 
 # ============================================================
@@ -47,6 +46,7 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
 # ============================================================
 def _make_request(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Wrapper request dgn error handling & retry 3x."""
+    import requests  # lazy: ~45ms import, hanya dibutuhkan saat call API
 
     url = f"{GEMINI_ENDPOINT}/{GEMINI_MODEL}:generateContent?key={GEMINI_API_KEY}"
 
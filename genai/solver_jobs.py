@@ -0,0 +1,120 @@
+# budget_optimizer/genai/solver_jobs.py
+"""
+Solver Jobs
+-----------
+Menjalankan ``AIRouter.solve`` di background thread supaya script
+Streamlit tidak ter-block selama chain A* → Greedy → SA berjalan.
+
+submit_solve(...) mengembalikan SolveJob (job handle) yang bisa:
+- di-poll progress-nya (tier aktif, nodes expanded, best h)
+- dicek apakah sudah selesai / diambil hasilnya
+- dibatalkan (cancel) — solver berhenti di checkpoint progress berikutnya
+
+Executor dibagi (shared) oleh semua session dalam satu proses worker.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+
+from .ai_router import AIRouter
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Executor bersama (lazy, dibuat sekali per proses)."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            workers = int(os.environ.get("BUDGET_SOLVER_WORKERS", os.cpu_count() or 2))
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix="solver"
+            )
+        return _EXECUTOR
+
+
+class SolveJob:
+    """Handle untuk satu solve yang berjalan di executor."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._progress = {"tier": None, "nodes": 0, "best_h": None}
+        self._future = None
+
+    # ---------------------------------------------------------
+    # dipanggil dari thread solver
+    # ---------------------------------------------------------
+    def report(self, info: Dict[str, Any]) -> bool:
+        """Callback progress untuk AIRouter.solve. False = minta berhenti."""
+        with self._lock:
+            if info.get("tier") != self._progress.get("tier"):
+                # tier baru → reset statistik tier sebelumnya
+                self._progress = {"tier": info.get("tier")}
+            self._progress.update(info)
+        return not self._cancel.is_set()
+
+    # ---------------------------------------------------------
+    # dipanggil dari UI
+    # ---------------------------------------------------------
+    def progress(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._progress)
+
+    def cancel(self):
+        self._cancel.set()
+        if self._future is not None:
+            self._future.cancel()  # kalau masih antre, langsung batal
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def done(self) -> bool:
+        return self._future is not None and self._future.done()
+
+    def add_done_callback(self, fn):
+        """fn(job) dipanggil saat job selesai / dibatalkan."""
+        self._future.add_done_callback(lambda _: fn(self))
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Hasil solve; job yang dibatalkan sebelum jalan → status 'cancelled'."""
+        if self._future.cancelled():
+            return {"status": "cancelled", "final_state": None, "trace": []}
+        return self._future.result(timeout=timeout)
+
+
+def submit_solve(
+    state: Dict[str, int],
+    income: int,
+    minimums: Dict[str, int],
+    target: int,
+    delta: int,
+    *,
+    router: Optional[AIRouter] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+    warm_start: Optional[Dict[str, int]] = None,
+) -> SolveJob:
+    """
+    Submit solve ke executor dan langsung kembalikan job handle.
+
+    warm_start: final_state solve sebelumnya (lihat ``AIRouter.solve``).
+    """
+    router = router or AIRouter()
+    executor = executor or get_executor()
+
+    job = SolveJob()
+    job._future = executor.submit(
+        router.solve,
+        dict(state),
+        income,
+        minimums,
+        target,
+        delta,
+        progress=job.report,
+        warm_start=warm_start,
+    )
+    return job
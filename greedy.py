@@ -1,104 +1,172 @@
 # budget_optimizer/greedy.py
 
-from copy import deepcopy
+import heapq
 
+from .astar import heuristic
+from .utils import drain, improvement, seed_state
 
-def greedy_optimize(
-    init_state, income, minimums, target=None, delta=50000, max_iter=300
+
+def _ceil_div(a, b):
+    return -(-a // b)
+
+
+def _take_largest(state, cats, floors, units, delta):
+    """
+    Kurangi total ``units`` × delta dari kategori terbesar (water-filling),
+    tanpa menurunkan kategori di bawah floor-nya. Return unit yang diambil.
+
+    Sama dengan "kurangi kategori terbesar satu delta, ulangi" tapi dihitung
+    langsung: cari level L terkecil dengan Σ langkah(L) ≤ units (binary
+    search, O(n log V)), lalu sisa unit diambil dari kategori di batas level
+    lewat max-heap. Runtime tidak bergantung pada besar gap.
+    """
+    room = {c: max((state[c] - floors[c]) // delta, 0) for c in cats}
+    units = min(units, sum(room.values()))
+    if units <= 0:
+        return 0
+
+    def steps(c, level):
+        return min(room[c], max(_ceil_div(state[c] - level, delta), 0))
+
+    def taken(level):
+        return sum(steps(c, level) for c in cats)
+
+    # di level ≤ floor terkecil semua room terpakai → taken(lo) ≥ units
+    lo, hi = min(floors[c] for c in cats) - delta, max(state[c] for c in cats)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if taken(mid) <= units:
+            hi = mid
+        else:
+            lo = mid + 1
+
+    cut = {c: steps(c, lo) for c in cats}
+    rest = units - sum(cut.values())
+
+    # kategori di batas level: satu unit lagi, yang terbesar dulu
+    boundary = [
+        (-(state[c] - cut[c] * delta), i, c)
+        for i, c in enumerate(cats)
+        if steps(c, lo - 1) > cut[c]
+    ]
+    heapq.heapify(boundary)
+    for _ in range(rest):
+        _, _, c = heapq.heappop(boundary)
+        cut[c] += 1
+
+    for c in cats:
+        state[c] -= cut[c] * delta
+    return units
+
+
+def greedy_iter(
+    init_state,
+    income,
+    minimums,
+    target=None,
+    delta=50000,
+    max_iter=300,
+    warm_start=None,
 ):
     """
     Greedy local adjustment (REVISI).
+
+    Tiap prioritas dihitung sekali dengan jumlah langkah delta yang pas
+    (closed-form), bukan satu delta per iterasi:
+      1. naikkan kategori di bawah minimum ke grid pertama ≥ minimum
+      2. overspend → potong kategori terbesar (water-filling, ≥ minimum)
+      3. kejar target tabungan: pakai sisa income dulu, lalu pindahkan
+         dari kategori non-tabungan terbesar; tabungan kelebihan
+         diturunkan tanpa jatuh di bawah target
+
+    max_iter: tidak dipakai lagi (dipertahankan untuk kompatibilitas).
+    warm_start: solusi sebelumnya; greedy mulai dari sana, bukan dari baseline.
+
+    Generator anytime: yield ``improvement`` untuk start state lalu setelah
+    tiap prioritas yang menurunkan score (= ``astar.heuristic``). Nilai
+    ``return`` = result akhir (lihat ``greedy_optimize``).
     """
 
-    state = deepcopy(init_state)
+    state = seed_state(init_state, warm_start)
     trace = []
 
     if "tabungan" not in state:
         state["tabungan"] = 0
 
-    def total_spend(s):
-        return sum(s.values())
-
-    # Main Loop
-    for i in range(max_iter):
-        spend = total_spend(state)
-        current_tabungan = state["tabungan"]
-
-        # Trace dikit aja biar gak berat
-        # trace.append({"method": "greedy", "status": f"iter={i}, tab={current_tabungan}"})
-
-        improved = False
-
-        # --------------------------------------------------------------
-        # PRIORITY 1: Kebutuhan Dasar (Jika di bawah minimum)
-        # --------------------------------------------------------------
-        violation_found = False
-        for cat, minv in minimums.items():
-            if state.get(cat, 0) < minv:
-                state[cat] += delta
-                improved = True
-                violation_found = True
-                break  # Fix satu per satu
-
-        if violation_found:
-            continue
-
-        # --------------------------------------------------------------
-        # PRIORITY 2: Overspending (Jika Total > Income)
-        # --------------------------------------------------------------
-        if spend > income:
-            # Kurangi kategori terbesar selain tabungan (jika mungkin)
-            # atau kurangi tabungan jika terpaksa
-            candidates = {k: v for k, v in state.items() if v > minimums.get(k, 0)}
-
-            if candidates:
-                # Prioritaskan mengurangi selain tabungan dulu jika tabungan belum over target
-                # Tapi kalau simpelnya: kurangi yang paling besar
-                biggest = max(candidates, key=candidates.get)
-                state[biggest] -= delta
-                improved = True
-            else:
-                # Stuck (sudah mentok minimum semua), break to avoid infinite loop
-                break
-
-        # --------------------------------------------------------------
-        # PRIORITY 3: Target Tabungan (Kejar Target)
-        # --------------------------------------------------------------
-        elif target is not None and target > 0:
-            diff = target - current_tabungan
-
-            # Jika tabungan kurang dari target, dan masih ada sisa income
-            if diff > 0:
-                # Cek apakah budget masih cukup untuk nambah
-                if spend + delta <= income:
-                    state["tabungan"] += delta
-                    improved = True
-                else:
-                    # Budget penuh, harus korbankan kategori lain demi tabungan?
-                    # Cari kategori non-esensial untuk dikurangi
-                    others = {
-                        k: v
-                        for k, v in state.items()
-                        if k != "tabungan" and v > minimums.get(k, 0)
-                    }
-                    if others:
-                        victim = max(others, key=others.get)
-                        state[victim] -= delta
-                        state["tabungan"] += delta
-                        improved = True
-
-            # Jika tabungan kebanyakan (jarang terjadi, tapi just in case)
-            elif diff < 0:  # tabungan > target
-                if state["tabungan"] - delta >= minimums.get("tabungan", 0):
-                    state["tabungan"] -= delta
-                    improved = True
-
-        if not improved:
-            break
+    cats = list(state.keys())
+    floors = {c: minimums.get(c, 0) for c in cats}
+
+    best = heuristic(state, income, minimums, target)
+    stats = {"phase": 0}
+    yield improvement("greedy", state, best, stats)
+
+    def improved(phase):
+        nonlocal best
+        score = heuristic(state, income, minimums, target)
+        if score < best:
+            best = score
+            stats["phase"] = phase
+            yield improvement("greedy", state, score, stats)
+
+    # --------------------------------------------------------------
+    # PRIORITY 1: Kebutuhan Dasar (Jika di bawah minimum)
+    # --------------------------------------------------------------
+    for cat, minv in minimums.items():
+        val = state.get(cat, 0)
+        if val < minv:
+            state[cat] = val + _ceil_div(minv - val, delta) * delta
+            if cat not in floors:
+                cats.append(cat)
+                floors[cat] = minv
+
+    yield from improved(1)
+
+    # --------------------------------------------------------------
+    # PRIORITY 2: Overspending (Jika Total > Income)
+    # --------------------------------------------------------------
+    spend = sum(state.values())
+    if spend > income:
+        units = _ceil_div(spend - income, delta)
+        spend -= _take_largest(state, cats, floors, units, delta) * delta
+
+        yield from improved(2)
+
+    # --------------------------------------------------------------
+    # PRIORITY 3: Target Tabungan (Kejar Target)
+    # --------------------------------------------------------------
+    if spend <= income and target is not None and target > 0:
+        diff = target - state["tabungan"]
+
+        if diff > 0:
+            units = _ceil_div(diff, delta)
+
+            # sisa income dulu
+            free = min(units, (income - spend) // delta)
+            state["tabungan"] += free * delta
+            spend += free * delta
+            units -= free
+
+            # budget penuh → korbankan kategori non-tabungan terbesar
+            others = [c for c in cats if c != "tabungan"]
+            moved = _take_largest(state, others, floors, units, delta)
+            state["tabungan"] += moved * delta
+
+        elif diff < 0:
+            # tabungan kebanyakan: turunkan tanpa jatuh di bawah target / minimum
+            floor = max(target, floors.get("tabungan", 0))
+            state["tabungan"] -= max((state["tabungan"] - floor) // delta, 0) * delta
+            spend = sum(state.values())
+
+        yield from improved(3)
 
     return {
         "final_state": state,
         "method": "greedy",
-        "status": "success" if total_spend(state) <= income else "partial",
+        "status": "success" if spend <= income else "partial",
         "trace": trace,
     }
+
+
+def greedy_optimize(*args, **kwargs):
+    """Greedy sampai selesai; parameter sama dengan ``greedy_iter``."""
+    return drain(greedy_iter(*args, **kwargs))
@@ -0,0 +1,169 @@
+# budget_optimizer/lattice.py
+"""
+Lattice Encoder
+---------------
+Semua state A* berada di lattice delta: tiap kategori = start ± k·delta,
+tidak di bawah minimum, dan (dengan dominance pruning) tidak naik melewati
+minimum / target. Lattice itu dibatasi per kategori, jadi satu state bisa
+dipetakan ke satu integer lewat mixed-radix packing:
+
+    code = (((k_0) · r_1 + k_1) · r_2 + k_2) ...,   0 ≤ k_i < r_i
+
+``VisitedSet`` memakai code itu sebagai indeks bit di ``bytearray`` (1 bit
+per titik lattice). Jika lattice terlalu besar untuk bitset, code disimpan
+di ``set`` integer; state di luar lattice (mis. warm start dengan grid lain)
+memakai key tuple biasa.
+"""
+
+from typing import Dict, Hashable, Iterable, Optional
+
+# Batas ukuran bitset (bit). 2**26 bit = 8 MB per pencarian.
+BITSET_MAX_BITS = 1 << 26
+
+# Estimasi kasar byte per entry set (slot hash + objek key)
+INT_ENTRY_BYTES = 64
+TUPLE_ENTRY_BYTES = 512
+
+
+class LatticeEncoder:
+    """
+    Mixed-radix encoder untuk lattice delta di sekitar ``starts``.
+
+    bounded_up:
+        True (dominance pruning aktif) → kategori hanya naik sampai grid
+        pertama ≥ minimum (tabungan: ≥ target). False → batas atas
+        start + income.
+    """
+
+    def __init__(
+        self,
+        starts: Iterable[Dict[str, int]],
+        minimums: Dict[str, int],
+        delta: int,
+        target: Optional[int] = None,
+        income: int = 0,
+        bounded_up: bool = True,
+    ):
+        starts = list(starts)
+        self.cats = list(starts[0])
+        self.delta = delta
+        self.lo, self.radix = [], []
+
+        for cat in self.cats:
+            origin = starts[0][cat]
+            # start lain dengan grid berbeda → state-nya di luar lattice
+            vals = [s[cat] for s in starts if (s[cat] - origin) % delta == 0]
+            floor = minimums.get(cat, 0)
+
+            lo = min(v - max((v - floor) // delta, 0) * delta for v in vals)
+            if bounded_up:
+                goal = target if cat == "tabungan" and target else floor
+                hi = max(vals + [lo + max(-(-(goal - lo) // delta), 0) * delta])
+            else:
+                hi = max(vals) + income
+
+            self.lo.append(lo)
+            self.radix.append((hi - lo) // delta + 1)
+
+        # stride[i] = r_{i+1} · r_{i+2} · ...  (bobot digit ke-i)
+        self.stride = [0] * len(self.cats)
+        self.size = 1
+        for i in reversed(range(len(self.cats))):
+            self.stride[i] = self.size
+            self.size *= self.radix[i]
+        self.index = {cat: i for i, cat in enumerate(self.cats)}
+
+    def encode(self, state: Dict[str, int]) -> Optional[int]:
+        """Code integer state, atau None jika state di luar lattice."""
+        code = 0
+        delta = self.delta
+        for cat, lo, r in zip(self.cats, self.lo, self.radix):
+            k, rem = divmod(state[cat] - lo, delta)
+            if rem or not 0 <= k < r:
+                return None
+            code = code * r + k
+        return code
+
+    def shift(self, code: Optional[int], cat: str, value: int, step: int):
+        """
+        Code tetangga yang hanya berbeda di ``cat`` (nilai baru ``value``,
+        ``step`` = ±1 langkah delta) — O(1), tanpa encode ulang.
+        """
+        if code is None:
+            return None
+        i = self.index[cat]
+        if not 0 <= (value - self.lo[i]) // self.delta < self.radix[i]:
+            return None
+        return code + step * self.stride[i]
+
+    @staticmethod
+    def key(state: Dict[str, int], code: Optional[int]) -> Hashable:
+        """Key hashable: code lattice, fallback tuple untuk state di luar."""
+        return tuple(sorted(state.items())) if code is None else code
+
+
+class VisitedSet:
+    """
+    Visited set di atas ``LatticeEncoder``: bitset ``bytearray`` jika
+    lattice ≤ ``max_bits``, selain itu ``set`` integer; state di luar
+    lattice masuk ``set`` tuple.
+    """
+
+    def __init__(self, encoder: LatticeEncoder, max_bits: int = BITSET_MAX_BITS):
+        self.encoder = encoder
+        self.bits = (
+            bytearray((encoder.size + 7) // 8) if encoder.size <= max_bits else None
+        )
+        self.codes = set()
+        self.other = set()
+        self.count = 0
+
+    @property
+    def kind(self) -> str:
+        return "bitset" if self.bits is not None else "set"
+
+    def has(self, state: Dict[str, int], code: Optional[int]) -> bool:
+        """Seperti ``in``, tapi memakai ``code`` yang sudah ada (tanpa encode)."""
+        if code is None:
+            return tuple(sorted(state.items())) in self.other
+        if self.bits is not None:
+            return bool(self.bits[code >> 3] & (1 << (code & 7)))
+        return code in self.codes
+
+    def add(self, state: Dict[str, int], code: Optional[int]) -> bool:
+        """
+        Tandai ``state`` (``code`` = hasil ``encode`` / ``shift``);
+        True jika sebelumnya belum ada.
+        """
+        if code is None:
+            key = tuple(sorted(state.items()))
+            if key in self.other:
+                return False
+            self.other.add(key)
+        elif self.bits is not None:
+            byte, mask = code >> 3, 1 << (code & 7)
+            if self.bits[byte] & mask:
+                return False
+            self.bits[byte] |= mask
+        else:
+            if code in self.codes:
+                return False
+            self.codes.add(code)
+        self.count += 1
+        return True
+
+    def __contains__(self, state: Dict[str, int]) -> bool:
+        return self.has(state, self.encoder.encode(state))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        """Perkiraan memori visited set (byte)."""
+        bits = len(self.bits) if self.bits is not None else 0
+        return (
+            bits
+            + len(self.codes) * INT_ENTRY_BYTES
+            + len(self.other) * TUPLE_ENTRY_BYTES
+        )
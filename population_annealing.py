@@ -0,0 +1,139 @@
+# budget_optimizer/population_annealing.py
+"""
+Population Annealing (NumPy)
+----------------------------
+Versi vektor dari ``simulated_annealing``: ``n_chains`` chain disimpan
+sebagai satu array integer (n_chains, n_kategori) dan semua chain
+di-propose, di-skor, dan di-accept sekaligus per step.
+
+- Objective & move set sama dengan SA "step" (satu kategori ±delta,
+  tidak boleh di bawah minimum, spend ≤ income + delta)
+- Skor di-update incremental per chain (spend, violation, tabungan)
+- Metropolis: satu draw uniform (vektor) per step untuk semua chain
+
+Return shape sama dengan ``simulated_annealing``; final_state = state
+terbaik dari seluruh populasi.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from .simulated_annealing import MINIMUM_PENALTY, OVERFLOW_PENALTY, PROGRESS_EVERY
+from .utils import seed_state
+
+
+def _scores(spend, violation, tabungan, income, target):
+    err = MINIMUM_PENALTY * violation + OVERFLOW_PENALTY * np.maximum(spend - income, 0)
+    if target is not None:
+        err = err + np.abs(target - tabungan)
+    return err
+
+
+def population_annealing(
+    init_state: Dict[str, int],
+    income: int,
+    minimums: Dict[str, int],
+    target: Optional[int] = None,
+    delta: int = 50000,
+    n_chains: int = 256,
+    T_start: float = 1.0,
+    T_end: float = 0.01,
+    steps: int = 3000,
+    seed=None,
+    progress=None,
+    warm_start=None,
+):
+    """
+    SA untuk ``n_chains`` chain sekaligus.
+
+    seed: seed ``numpy.random.default_rng`` (None = acak).
+    progress: seperti SA, dipanggil tiap PROGRESS_EVERY step dengan
+        ``{"steps": ..., "best_score": ...}``; ``False`` = stop.
+    warm_start: semua chain dimulai dari solusi sebelumnya.
+    """
+    rng = np.random.default_rng(seed)
+    target = target if target is not None and target > 0 else None
+
+    start = seed_state(init_state, warm_start)
+    if "tabungan" not in start:
+        start["tabungan"] = 0
+
+    cats = list(start.keys())
+    n = len(cats)
+    tab = cats.index("tabungan")
+    mins = np.array([minimums.get(c, 0) for c in cats], dtype=np.int64)
+    floors = np.maximum(mins, 0)
+    # kategori di minimums yang tidak ada di state → pelanggaran konstan
+    missing = sum(max(v, 0) for c, v in minimums.items() if c not in start)
+
+    X = np.tile(np.array([start[c] for c in cats], dtype=np.int64), (n_chains, 1))
+    rows = np.arange(n_chains)
+
+    spend = X.sum(axis=1)
+    violation = np.maximum(mins - X, 0).sum(axis=1) + missing
+    score = _scores(spend, violation, X[:, tab], income, target)
+
+    best_X = X.copy()
+    best_score = score.copy()
+
+    stats = {"accepted": 0, "rejected": 0, "infeasible": 0}
+    status = "success"
+
+    for step in range(steps):
+        if progress is not None and step % PROGRESS_EVERY == 0:
+            if progress({"steps": step, "best_score": int(best_score.min())}) is False:
+                status = "cancelled"
+                break
+
+        T = T_start * ((T_end / T_start) ** (step / steps))
+
+        # proposal untuk semua chain
+        cat = rng.integers(n, size=n_chains)
+        amount = (rng.integers(2, size=n_chains) * 2 - 1) * delta
+
+        old = X[rows, cat]
+        new = old + amount
+        feasible = (new >= floors[cat]) & (
+            (amount < 0) | (spend + amount <= income + delta)
+        )
+
+        new_spend = spend + amount
+        new_violation = (
+            violation + np.maximum(mins[cat] - new, 0) - np.maximum(mins[cat] - old, 0)
+        )
+        new_tab = X[:, tab] + np.where(cat == tab, amount, 0)
+        new_score = _scores(new_spend, new_violation, new_tab, income, target)
+
+        # Metropolis (satu draw vektor untuk semua chain)
+        d_score = new_score - score
+        u = rng.random(n_chains)
+        with np.errstate(over="ignore"):
+            accept = feasible & ((d_score < 0) | (u < np.exp(-d_score / (T + 1e-9))))
+
+        n_acc = int(accept.sum())
+        n_feas = int(feasible.sum())
+        stats["accepted"] += n_acc
+        stats["rejected"] += n_feas - n_acc
+        stats["infeasible"] += n_chains - n_feas
+
+        X[rows[accept], cat[accept]] = new[accept]
+        spend = np.where(accept, new_spend, spend)
+        violation = np.where(accept, new_violation, violation)
+        score = np.where(accept, new_score, score)
+
+        improved = score < best_score
+        if improved.any():
+            best_X[improved] = X[improved]
+            best_score[improved] = score[improved]
+
+    winner = int(np.argmin(best_score))  # seri → chain index terkecil
+
+    return {
+        "final_state": {c: int(v) for c, v in zip(cats, best_X[winner])},
+        "method": "population_annealing",
+        "status": status,
+        "trace": [],
+        "score": int(best_score[winner]),
+        "stats": stats | {"chains": n_chains},
+    }
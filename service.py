@@ -0,0 +1,348 @@
+# budget_optimizer/service.py
+"""
+Headless Solve Service
+----------------------
+HTTP/JSON service (stdlib, tanpa Streamlit) di atas AIRouter, supaya
+optimizer bisa dipanggil service lain dan di-scale horizontal di
+belakang load balancer.
+
+Endpoint:
+  POST /solve         → satu budget  (body: state, income, target, delta,
+                        warm_start opsional = final_state solve sebelumnya)
+  POST /batch-solve   → banyak budget (body: {"items": [...]})
+  POST /validate      → validate_final_state (body: final_state, income, ...)
+  GET  /healthz       → status worker pool
+
+Fitur:
+- Worker pool terbatas (ThreadPoolExecutor) + antrean terbatas.
+  Jika slot penuh → 503 + Retry-After (backpressure, bukan antre tanpa batas)
+- Deadline per request ("deadline_ms"); lewat deadline → job di-cancel, 504
+- HTTP/1.1 keep-alive (Content-Length selalu dikirim)
+
+Jalankan:
+  python -m budget_optimizer.service --port 8080 --workers 4 --queue 32
+"""
+
+import argparse
+import dataclasses
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+
+from .config import MINIMUMS
+from .genai.ai_router import AIRouter
+from .genai.solver_jobs import submit_solve
+from .genai.validator import validate_final_state
+
+
+class ServiceBusy(Exception):
+    """Semua slot worker + antrean sedang terpakai."""
+
+
+class BadRequest(Exception):
+    """Body request tidak valid."""
+
+
+# ---------------------------------------------------------
+# Request parsing
+# ---------------------------------------------------------
+def _parse_solve_args(body: Dict[str, Any]) -> Dict[str, Any]:
+    if not isinstance(body, dict):
+        raise BadRequest("Item solve harus berupa object")
+    state = body.get("state", body.get("baseline"))
+    if not isinstance(state, dict):
+        raise BadRequest("'state' (atau 'baseline') wajib berupa object")
+    if "income" not in body:
+        raise BadRequest("'income' wajib diisi")
+
+    warm_start = body.get("warm_start")
+    if warm_start is not None and not isinstance(warm_start, dict):
+        raise BadRequest("'warm_start' harus berupa object")
+    minimums = body.get("minimums", MINIMUMS)
+    if not isinstance(minimums, dict):
+        raise BadRequest("'minimums' harus berupa object")
+
+    try:
+        return {
+            "state": {k: int(v) for k, v in state.items()},
+            "income": int(body["income"]),
+            "minimums": {k: int(v) for k, v in minimums.items()},
+            "target": int(body.get("target") or 0),
+            "delta": int(body.get("delta", 50000)),
+            "warm_start": (
+                {k: int(v) for k, v in warm_start.items()} if warm_start else None
+            ),
+        }
+    except (TypeError, ValueError) as e:
+        raise BadRequest(f"Nilai numerik tidak valid: {e}")
+
+
+# ---------------------------------------------------------
+# Service core (bisa dipakai tanpa HTTP, mis. di test)
+# ---------------------------------------------------------
+class SolveService:
+    def __init__(
+        self,
+        *,
+        router: Optional[AIRouter] = None,
+        workers: int = 4,
+        max_pending: int = 32,
+        default_deadline_ms: int = 10000,
+    ):
+        self.router = router or AIRouter()
+        self.workers = workers
+        self.max_pending = max_pending
+        self.default_deadline_ms = default_deadline_ms
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="solve-service"
+        )
+        # slot = job yang sedang jalan + job yang antre
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._inflight = 0
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # slot accounting (backpressure)
+    # ---------------------------------------------------------
+    def _acquire(self, n: int):
+        taken = 0
+        for _ in range(n):
+            if not self._slots.acquire(blocking=False):
+                for _ in range(taken):
+                    self._slots.release()
+                raise ServiceBusy()
+            taken += 1
+        with self._lock:
+            self._inflight += n
+
+    def _release(self, _job=None):
+        with self._lock:
+            self._inflight -= 1
+        self._slots.release()
+
+    def _submit_all(self, parsed: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Submit job untuk slot yang sudah diambil (``_acquire``). Jika submit
+        gagal di tengah (mis. executor sudah shutdown), slot yang belum
+        punya job dikembalikan — yang sudah jalan dilepas callback-nya.
+        """
+        jobs = []
+        try:
+            for args in parsed:
+                jobs.append(self._submit(args))
+        except Exception:
+            for _ in range(len(parsed) - len(jobs)):
+                self._release()
+            for job in jobs:
+                job.cancel()
+            raise
+        return jobs
+
+    def _submit(self, args: Dict[str, Any]):
+        job = submit_solve(
+            args["state"],
+            args["income"],
+            args["minimums"],
+            args["target"],
+            args["delta"],
+            router=self.router,
+            executor=self._executor,
+            warm_start=args["warm_start"],
+        )
+        job.add_done_callback(self._release)
+        return job
+
+    @staticmethod
+    def _wait(job, timeout_s: float) -> Dict[str, Any]:
+        try:
+            return job.result(timeout=max(timeout_s, 0.0))
+        except FutureTimeout:
+            job.cancel()
+            return {"status": "timeout", "final_state": None}
+
+    def _deadline_s(self, body: Dict[str, Any]) -> float:
+        try:
+            return float(body.get("deadline_ms", self.default_deadline_ms)) / 1000.0
+        except (TypeError, ValueError) as e:
+            raise BadRequest(f"'deadline_ms' tidak valid: {e}")
+
+    # ---------------------------------------------------------
+    # endpoints
+    # ---------------------------------------------------------
+    def solve(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        args = _parse_solve_args(body)
+        timeout_s = self._deadline_s(body)  # validasi sebelum slot diambil
+        self._acquire(1)
+        (job,) = self._submit_all([args])
+        return self._wait(job, timeout_s)
+
+    def batch_solve(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        items = body.get("items")
+        if not isinstance(items, list):
+            raise BadRequest("'items' wajib berupa list")
+
+        parsed = [_parse_solve_args(item) for item in items]
+        timeout_s = self._deadline_s(body)
+        self._acquire(len(parsed))
+        jobs = self._submit_all(parsed)
+
+        # satu deadline untuk seluruh batch
+        end = time.monotonic() + timeout_s
+        results = [self._wait(job, end - time.monotonic()) for job in jobs]
+        return {"results": results}
+
+    def validate(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        final_state = body.get("final_state")
+        if not isinstance(final_state, dict):
+            raise BadRequest("'final_state' wajib berupa object")
+        if not isinstance(body.get("minimums", MINIMUMS), dict):
+            raise BadRequest("'minimums' harus berupa object")
+        return validate_final_state(
+            final_state,
+            body.get("minimums", MINIMUMS),
+            income=body.get("income"),
+        )
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = self._inflight
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "inflight": inflight,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------------------------------------------------
+# HTTP layer
+# ---------------------------------------------------------
+def _status_for(result: Dict[str, Any]) -> int:
+    return 504 if result.get("status") == "timeout" else 200
+
+
+def _json_default(obj):
+    # Action (rencana transfer) adalah dataclass
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    return str(obj)
+
+
+class SolveRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    service: SolveService = None  # di-set oleh make_server
+
+    def _send_json(self, code: int, payload: Any, headers: Tuple = ()):
+        data = json.dumps(payload, default=_json_default).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> Dict[str, Any]:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # body tidak bisa dibaca → koneksi tidak bisa dipakai ulang
+            self.close_connection = True
+            raise BadRequest("Header Content-Length tidak valid")
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            body = json.loads(raw or b"{}")
+        except json.JSONDecodeError as e:
+            raise BadRequest(f"JSON tidak valid: {e}")
+        if not isinstance(body, dict):
+            raise BadRequest("Body harus JSON object")
+        return body
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send_json(200, self.service.health())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        routes = {
+            "/solve": self.service.solve,
+            "/batch-solve": self.service.batch_solve,
+            "/validate": self.service.validate,
+        }
+        handler = routes.get(self.path)
+
+        try:
+            body = self._read_json()  # selalu dibaca agar koneksi bisa dipakai ulang
+            if handler is None:
+                self._send_json(404, {"error": "not found"})
+                return
+            result = handler(body)
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except ServiceBusy:
+            self._send_json(
+                503, {"error": "service busy, coba lagi"}, (("Retry-After", "1"),)
+            )
+            return
+        except Exception as e:
+            # error solver / bug: tetap balas JSON, jangan putus koneksi
+            self._send_json(500, {"error": f"internal error: {e}"})
+            return
+
+        self._send_json(_status_for(result), result)
+
+    def log_message(self, format, *args):
+        pass  # access log dimatikan; pakai reverse proxy / LB untuk logging
+
+
+def make_server(
+    host: str = "127.0.0.1", port: int = 8080, **service_kwargs
+) -> ThreadingHTTPServer:
+    service = SolveService(**service_kwargs)
+    handler = type("BoundSolveHandler", (SolveRequestHandler,), {"service": service})
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Budget optimizer solve service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=32, help="max pending jobs")
+    parser.add_argument("--deadline-ms", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    server = make_server(
+        args.host,
+        args.port,
+        workers=args.workers,
+        max_pending=args.queue,
+        default_deadline_ms=args.deadline_ms,
+    )
+    print(f"Solve service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.service.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,142 @@
 
 import math
 import random
-from copy import deepcopy
+from typing import Iterable, Optional
 
+from .utils import drain, improvement, seed_state
 
-def simulated_annealing(
+PROGRESS_EVERY = 50
+
+# Adaptive schedule
+CALIBRATION_SAMPLES = 64  # proposal acak untuk kalibrasi T0
+INITIAL_ACCEPTANCE = 0.3  # peluang menerima move "naik" rata-rata di T0
+ADAPTIVE_T_RATIO = 1e-3  # T_end = T0 * ratio
+REHEAT_FACTOR = 0.5  # T0 epoch berikutnya = T0 epoch sebelumnya * factor
+
+# Bobot penalti objective SA
+OVERFLOW_PENALTY = 100
+MINIMUM_PENALTY = 50
+
+
+class IncrementalScore:
+    """
+    Objective SA yang di-maintain secara incremental.
+
+    Menyimpan running spend, total pelanggaran minimum, dan skor saat ini,
+    sehingga efek perubahan satu kategori (``delta``) dihitung O(1) tanpa
+    menyalin state maupun menghitung ulang ``sum(state.values())``.
+
+    ``state`` di-mutasi in-place oleh ``apply``; undo = ``apply`` dengan
+    tanda kebalikan.
+    """
+
+    def __init__(self, state, income, minimums, target=None):
+        self.state = state
+        self.income = income
+        self.minimums = minimums
+        self.target = target if target is not None and target > 0 else None
+
+        self.spend = sum(state.values())
+        self.violation = sum(
+            max(minv - state.get(cat, 0), 0) for cat, minv in minimums.items()
+        )
+        self.score = self._score(self.spend, self.violation, state.get("tabungan", 0))
+
+    def _score(self, spend, violation, tabungan):
+        err = MINIMUM_PENALTY * violation
+        if spend > self.income:
+            err += (spend - self.income) * OVERFLOW_PENALTY
+        if self.target is not None:
+            err += abs(self.target - tabungan)
+        return err
+
+    def _violation_change(self, cat, amount):
+        minv = self.minimums.get(cat)
+        if minv is None:
+            return 0
+        val = self.state[cat]
+        return max(minv - val - amount, 0) - max(minv - val, 0)
+
+    def delta(self, cat, amount):
+        """Perubahan skor jika ``state[cat] += amount`` (tanpa mutasi)."""
+        tab = self.state.get("tabungan", 0) + (amount if cat == "tabungan" else 0)
+        new = self._score(
+            self.spend + amount,
+            self.violation + self._violation_change(cat, amount),
+            tab,
+        )
+        return new - self.score
+
+    def apply(self, cat, amount):
+        """``state[cat] += amount`` sambil meng-update spend / violation / skor."""
+        self.violation += self._violation_change(cat, amount)
+        self.spend += amount
+        self.state[cat] += amount
+        self.score = self._score(
+            self.spend, self.violation, self.state.get("tabungan", 0)
+        )
+
+    def transfer_delta(self, src, dst, amount):
+        """Perubahan skor untuk transfer src → dst (total spend tetap)."""
+        tab = self.state.get("tabungan", 0)
+        if src == "tabungan":
+            tab -= amount
+        if dst == "tabungan":
+            tab += amount
+        violation = (
+            self.violation
+            + self._violation_change(src, -amount)
+            + self._violation_change(dst, amount)
+        )
+        return self._score(self.spend, violation, tab) - self.score
+
+    def transfer(self, src, dst, amount):
+        self.apply(src, -amount)
+        self.apply(dst, amount)
+
+
+class _SourcePool:
+    """
+    Kategori yang masih bisa dikurangi ``delta`` tanpa turun di bawah
+    minimum. Di-update hanya saat kategori berubah; sampling O(1).
+    """
+
+    def __init__(self, state, floors, delta):
+        self.state, self.floors, self.delta = state, floors, delta
+        self.items, self.pos = [], {}
+        for cat in state:
+            self.update(cat)
+
+    def update(self, cat):
+        ok = self.state[cat] - self.delta >= self.floors[cat]
+        if ok and cat not in self.pos:
+            self.pos[cat] = len(self.items)
+            self.items.append(cat)
+        elif not ok and cat in self.pos:
+            i = self.pos.pop(cat)
+            last = self.items.pop()
+            if last != cat:
+                self.items[i] = last
+                self.pos[last] = i
+
+
+def _calibrate_temperature(propose, samples=CALIBRATION_SAMPLES):
+    """
+    T0 supaya move "naik" rata-rata diterima dengan peluang
+    INITIAL_ACCEPTANCE: T0 = -mean(Δ⁺) / ln(p0).
+    """
+    uphill = []
+    for _ in range(samples):
+        proposal = propose()
+        if proposal is not None and proposal[1] > 0:
+            uphill.append(proposal[1])
+
+    if not uphill:
+        return 1.0  # semua move turun / netral → suhu tidak berpengaruh
+    return -(sum(uphill) / len(uphill)) / math.log(INITIAL_ACCEPTANCE)
+
+
+def simulated_annealing_iter(
     init_state: dict,
     income: int,
     minimums: dict,
@@ -13,87 +145,241 @@ def simulated_annealing(
     delta: int = 50000,
     T_start: float = 1.0,
     T_end: float = 0.01,
-    steps: int = 500,
+    steps: int = 3000,
+    progress=None,
+    warm_start=None,
+    move_set: str = "step",
+    seed=None,
+    schedule: str = "geometric",
+    patience: int = None,
+    reheats: int = 0,
 ):
     """
     SA untuk penyesuaian halus (REVISI).
+
+    seed:
+        None → modul ``random`` global (perilaku lama). Selain itu chain
+        memakai ``random.Random(seed)`` sendiri: seed sama = hasil identik.
+
+    move_set:
+        "step"     — satu kategori ±delta (bisa mengubah total spend)
+        "transfer" — src −delta, dst +delta (total tetap); src hanya diambil
+                     dari kategori yang masih di atas minimum
+        "mixed"    — 50/50 keduanya (step untuk memperbaiki total,
+                     transfer untuk menata ulang isi)
+
+    progress:
+        callable opsional, dipanggil tiap PROGRESS_EVERY step dengan
+        ``{"steps": ..., "best_score": ...}``. Return ``False`` = stop.
+    warm_start:
+        solusi sebelumnya; chain dimulai dari sana, bukan dari baseline.
+
+    schedule:
+        "geometric" — T_start → T_end tetap selama ``steps`` (perilaku lama)
+        "adaptive"  — T0 dikalibrasi dari skor delta proposal acak (skala
+                      penalti rupiah), berhenti saat skor 0 tercapai atau
+                      best tidak membaik selama ``patience`` step; jika
+                      ``reheats`` > 0, suhu dinaikkan lagi dulu sebelum stop.
+                      T_start / T_end diabaikan.
+
+    Result memuat "score" (skor terbaik) dan "stats": jumlah proposal
+    accepted / rejected / infeasible, step yang benar-benar dijalankan.
+
+    Generator anytime: yield ``improvement`` untuk start state dan setiap
+    best baru (score turun). Nilai ``return`` = result di atas (lihat
+    ``simulated_annealing``).
     """
+    if move_set not in ("step", "transfer", "mixed"):
+        raise ValueError(f"move_set tidak dikenal: {move_set!r}")
+    if schedule not in ("geometric", "adaptive"):
+        raise ValueError(f"schedule tidak dikenal: {schedule!r}")
 
-    state = deepcopy(init_state)
+    rng = random if seed is None else random.Random(seed)
+
+    state = seed_state(init_state, warm_start)
     if "tabungan" not in state:
         state["tabungan"] = 0
 
-    best = deepcopy(state)
     trace = []
+    cats = list(state.keys())
+    floors = {cat: max(minimums.get(cat, 0), 0) for cat in cats}
+    spend_cap = income + delta
 
-    def spend(s):
-        return sum(s.values())
-
-    # Objective function (minimize error)
-    def score(s):
-        s_spend = spend(s)
-        current_tabungan = s.get("tabungan", 0)
+    cur = IncrementalScore(state, income, minimums, target)
+    sources = _SourcePool(state, floors, delta)
+    best = dict(state)
+    best_score = cur.score
 
-        err = 0
+    def propose():
+        """(move, skor delta) tanpa mutasi; None jika proposal infeasible."""
+        if move_set == "transfer" or (move_set == "mixed" and rng.random() < 0.5):
+            if not sources.items:
+                return None
+            src = rng.choice(sources.items)
+            dst = cats[rng.randrange(len(cats) - 1)]
+            if dst == src:
+                dst = cats[-1]  # uniform di antara kategori selain src
+            return (src, dst, None), cur.transfer_delta(src, dst, delta)
 
-        # 1. Penalty income overflow (Sangat Mahal)
-        if s_spend > income:
-            err += (s_spend - income) * 100
+        cat = rng.choice(cats)
+        amount = rng.choice([-1, 1]) * delta
 
-        # 2. Penalty minimum violations (Mahal)
-        for cat, minv in minimums.items():
-            val = s.get(cat, 0)
-            if val < minv:
-                err += (minv - val) * 50
+        # Hard constraints check (biar gak buang waktu)
+        if state[cat] + amount < floors[cat]:
+            return None
+        # Jangan biarkan total spend jauh di atas income
+        # Biar SA gak 'jalan-jalan' ke area yang gak valid
+        # (move turun selalu boleh, supaya start yang overspend bisa keluar)
+        if amount > 0 and cur.spend + amount > spend_cap:
+            return None
+        return (cat, None, amount), cur.delta(cat, amount)
 
-        # 3. Penalty target saving miss
-        if target is not None and target > 0:
-            err += abs(target - current_tabungan)
+    stats = {"accepted": 0, "rejected": 0, "infeasible": 0}
+    status = "success"
 
-        return err
+    adaptive = schedule == "adaptive"
+    if adaptive:
+        T_start = _calibrate_temperature(propose)
+        T_end = T_start * ADAPTIVE_T_RATIO
+        patience = patience or max(steps // 10, 100)
+        stats.update({"T0": T_start, "reheats": 0})
 
-    best_score = score(best)
+    epoch_start = last_improvement = 0
+    step = 0
+    yield improvement("simulated_annealing", best, best_score, stats | {"steps": 0})
 
     for step in range(steps):
-        T = T_start * ((T_end / T_start) ** (step / steps))
+        if progress is not None and step % PROGRESS_EVERY == 0:
+            if progress({"steps": step, "best_score": best_score}) is False:
+                status = "cancelled"
+                break
 
-        # Mutasi
-        cat = random.choice(list(state.keys()))
-        new_state = deepcopy(state)
+        if adaptive:
+            if best_score == 0:
+                break  # skor tidak bisa di bawah 0 → optimum
+            if step - last_improvement >= patience:
+                if stats["reheats"] >= reheats:
+                    break
+                # reheat: epoch baru dengan suhu awal lebih rendah
+                stats["reheats"] += 1
+                T_start *= REHEAT_FACTOR
+                T_end *= REHEAT_FACTOR
+                epoch_start = last_improvement = step
 
-        direction = random.choice([-1, 1])
-        new_state[cat] += direction * delta
-
-        # Hard constraints check (biar gak buang waktu)
-        if new_state[cat] < minimums.get(cat, 0):
-            continue
-        if new_state[cat] < 0:
-            continue
+        T = T_start * ((T_end / T_start) ** ((step - epoch_start) / steps))
 
-        # Optimization: Jangan biarkan total spend jauh di atas income
-        # Biar SA gak 'jalan-jalan' ke area yang gak valid
-        if spend(new_state) > income + delta:
+        # Mutasi (dievaluasi dulu; state baru diubah kalau diterima)
+        proposal = propose()
+        if proposal is None:
+            stats["infeasible"] += 1
             continue
-
-        old_score = score(state)
-        new_score = score(new_state)
+        (src, dst, amount), delta_score = proposal
 
         # Acceptance probability
-        delta_score = new_score - old_score
         if delta_score < 0:
             accept_prob = 1.0
         else:
             accept_prob = math.exp(-delta_score / (T + 1e-9))
 
-        if random.random() < accept_prob:
-            state = new_state
-            if new_score < best_score:
-                best = deepcopy(new_state)
-                best_score = new_score
+        if rng.random() >= accept_prob:
+            stats["rejected"] += 1
+            continue
+
+        stats["accepted"] += 1
+        if dst is not None:
+            cur.transfer(src, dst, delta)
+            sources.update(src)
+            sources.update(dst)
+        else:
+            cur.apply(src, amount)
+            sources.update(src)
+
+        if cur.score < best_score:
+            best = dict(state)
+            best_score = cur.score
+            last_improvement = step
+            yield improvement(
+                "simulated_annealing", best, best_score, stats | {"steps": step}
+            )
+    else:
+        step = steps
+
+    stats["steps"] = step
 
     return {
         "final_state": best,
         "method": "simulated_annealing",
-        "status": "success",
+        "status": status,
         "trace": trace,
+        "score": best_score,
+        "stats": stats,
+    }
+
+
+def simulated_annealing(*args, **kwargs):
+    """SA sampai selesai; parameter sama dengan ``simulated_annealing_iter``."""
+    return drain(simulated_annealing_iter(*args, **kwargs))
+
+
+# ============================================================
+# Multi-start: K chain independen (paralel antar proses)
+# ============================================================
+def _run_chain(args):
+    seed, sa_args, sa_kwargs = args
+    return simulated_annealing(*sa_args, seed=seed, **sa_kwargs)
+
+
+def multi_start_sa(
+    init_state: dict,
+    income: int,
+    minimums: dict,
+    target: int = None,
+    delta: int = 50000,
+    seeds: Iterable[int] = range(8),
+    workers: Optional[int] = None,
+    executor=None,
+    **sa_kwargs,
+):
+    """
+    Jalankan satu chain SA per seed (``random.Random(seed)`` masing-masing)
+    dan ambil yang terbaik.
+
+    Pemilihan deterministik: skor terkecil, seri → seed yang lebih dulu di
+    ``seeds``. Jadi seed set yang sama selalu memberi output yang identik,
+    berapa pun jumlah worker.
+
+    workers=1 → jalan serial di proses ini. ``executor`` bisa diisi pool
+    yang sudah ada supaya tidak membayar start-up proses tiap panggilan.
+
+    Result = result chain terbaik + "seed" dan "chains" (statistik per chain).
+    """
+    seeds = list(seeds)
+    if not seeds:
+        raise ValueError("seeds tidak boleh kosong")
+
+    jobs = [
+        (seed, (init_state, income, minimums, target, delta), sa_kwargs)
+        for seed in seeds
+    ]
+
+    if executor is not None:
+        results = list(executor.map(_run_chain, jobs))
+    elif workers == 1 or len(seeds) == 1:
+        results = [_run_chain(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chain, jobs))
+
+    chains = [
+        {"seed": seed, "status": r["status"], "score": r["score"], **r["stats"]}
+        for seed, r in zip(seeds, results)
+    ]
+    best = min(range(len(results)), key=lambda i: (results[i]["score"], i))
+
+    return results[best] | {
+        "method": "simulated_annealing_multistart",
+        "seed": seeds[best],
+        "chains": chains,
     }
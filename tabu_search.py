@@ -0,0 +1,182 @@
+# budget_optimizer/tabu_search.py
+"""
+Tabu Search
+-----------
+Local search deterministik di neighborhood yang sama dengan SA:
+  - "step"     — satu kategori ±delta
+  - "transfer" — src −delta, dst +delta (total tetap)
+  - "mixed"    — keduanya
+
+Tiap iterasi semua move dievaluasi O(1) lewat ``IncrementalScore`` dan move
+terbaik diambil — juga kalau skornya naik, sehingga search bisa keluar dari
+plateau / local minimum (beda dengan greedy yang berhenti di sana).
+
+- Tabu list: kategori yang baru dipindah tidak boleh disentuh selama
+  ``tenure`` iterasi (mencegah bolak-balik di plateau)
+- Aspiration: move tabu tetap boleh jika menghasilkan best baru
+- Seri dipecah dengan urutan kategori → hasil identik setiap run
+"""
+
+from typing import Dict, Optional
+
+from .simulated_annealing import PROGRESS_EVERY, IncrementalScore
+from .utils import drain, improvement, seed_state
+
+TABU_TENURE = 2
+TABU_PATIENCE = 200
+
+
+def tabu_search_iter(
+    init_state: Dict[str, int],
+    income: int,
+    minimums: Dict[str, int],
+    target: Optional[int] = None,
+    delta: int = 50000,
+    max_iter: int = 2000,
+    tenure: int = TABU_TENURE,
+    patience: int = TABU_PATIENCE,
+    move_set: str = "mixed",
+    progress=None,
+    warm_start=None,
+):
+    """
+    Tabu search sebagai generator anytime (yield ``improvement`` untuk start
+    state dan setiap best baru; nilai ``return`` = result akhir).
+
+    Objective = skor SA (penalti minimum, overspend, |target − tabungan|).
+    Berhenti saat skor 0, ``max_iter`` iterasi, atau best tidak membaik
+    selama ``patience`` iterasi.
+
+    status: "success" jika skor terbaik 0 (semua constraint & target
+    terpenuhi), "partial" jika belum, "cancelled" jika progress → False.
+    stats: iterations, aspirations (move tabu yang diizinkan), evaluated.
+    """
+    if move_set not in ("step", "transfer", "mixed"):
+        raise ValueError(f"move_set tidak dikenal: {move_set!r}")
+
+    state = seed_state(init_state, warm_start)
+    if "tabungan" not in state:
+        state["tabungan"] = 0
+
+    cats = list(state.keys())
+    floors = {cat: max(minimums.get(cat, 0), 0) for cat in cats}
+    spend_cap = income + delta
+    steps = move_set in ("step", "mixed")
+    transfers = move_set in ("transfer", "mixed")
+
+    cur = IncrementalScore(state, income, minimums, target)
+    best = dict(state)
+    best_score = cur.score
+
+    tabu_until = {cat: 0 for cat in cats}
+    stats = {"iterations": 0, "aspirations": 0, "evaluated": 0}
+    status = "success"
+    last_improvement = 0
+
+    yield improvement("tabu_search", best, best_score, stats)
+
+    for it in range(1, max_iter + 1):
+        if best_score == 0 or it - last_improvement > patience:
+            break
+        if progress is not None and it % PROGRESS_EVERY == 0:
+            if progress({"steps": it, "best_score": best_score}) is False:
+                status = "cancelled"
+                break
+
+        # chosen = (key, move, aspirated); lihat ``_admit``
+        chosen = None
+        order = 0
+        for src in cats:
+            movable = state[src] - delta >= floors[src]
+
+            if steps:
+                for amount in (-delta, delta):
+                    if amount < 0 and not movable:
+                        continue
+                    if amount > 0 and cur.spend + amount > spend_cap:
+                        continue
+                    new = cur.score + cur.delta(src, amount)
+                    order += 1
+                    chosen = _admit(
+                        chosen,
+                        new,
+                        order,
+                        (src, None, amount),
+                        (src,),
+                        it,
+                        tabu_until,
+                        best_score,
+                    )
+
+            if transfers and movable:
+                for dst in cats:
+                    if dst == src:
+                        continue
+                    new = cur.score + cur.transfer_delta(src, dst, delta)
+                    order += 1
+                    chosen = _admit(
+                        chosen,
+                        new,
+                        order,
+                        (src, dst, delta),
+                        (src, dst),
+                        it,
+                        tabu_until,
+                        best_score,
+                    )
+
+        stats["evaluated"] += order
+        stats["iterations"] = it
+        if chosen is None:
+            break  # tidak ada move feasible
+
+        _, (src, dst, amount), aspirated = chosen
+        if aspirated:
+            stats["aspirations"] += 1
+
+        if dst is None:
+            cur.apply(src, amount)
+        else:
+            cur.transfer(src, dst, amount)
+            tabu_until[dst] = it + tenure
+        tabu_until[src] = it + tenure
+
+        if cur.score < best_score:
+            best = dict(state)
+            best_score = cur.score
+            last_improvement = it
+            yield improvement("tabu_search", best, best_score, stats)
+
+    if status != "cancelled":
+        status = "success" if best_score == 0 else "partial"
+
+    return {
+        "final_state": best,
+        "method": "tabu_search",
+        "status": status,
+        "trace": [],
+        "score": best_score,
+        "stats": stats,
+    }
+
+
+def _admit(chosen, new, order, move, touched, it, tabu_until, best_score):
+    """
+    Bandingkan kandidat dengan pilihan sejauh ini. Move yang menyentuh
+    kategori tabu hanya lolos lewat aspiration (skor < best). Jika semua
+    move tabu, move terbaik tetap diambil supaya search tidak macet.
+    """
+    tabu = any(tabu_until[c] >= it for c in touched)
+    aspirated = tabu and new < best_score
+    admissible = not tabu or aspirated
+
+    # prioritas: admissible dulu, lalu skor, lalu urutan evaluasi
+    key = (not admissible, new, order)
+    if chosen is None or key < chosen[0]:
+        return key, move, aspirated
+    return chosen
+
+
+def tabu_search(*args, **kwargs):
+    """Tabu search sampai selesai; parameter sama dengan ``tabu_search_iter``."""
+    return drain(tabu_search_iter(*args, **kwargs))
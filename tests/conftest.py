@@ -0,0 +1,36 @@
+# budget_optimizer/tests/conftest.py
+"""Data & router bersama untuk test solver."""
+
+import pytest
+
+from budget_optimizer.genai.ai_router import AIRouter
+
+# Baseline standar (total 2.800.000); modul test mengimpor dari sini
+BASELINE = {
+    "kos": 1000000,
+    "makan": 800000,
+    "transport": 200000,
+    "internet": 100000,
+    "jajan": 400000,
+    "hiburan": 300000,
+    "tabungan": 0,
+}
+
+
+class NoLPRouter(AIRouter):
+    """Router tanpa tier LP (seperti scipy tidak ter-install)."""
+
+    def try_lp(self, *args):
+        return self._pkg(method="LP (HiGHS)", status="unavailable")
+
+
+@pytest.fixture
+def baseline():
+    """Salinan BASELINE (solver boleh memodifikasi state awal)."""
+    return dict(BASELINE)
+
+
+@pytest.fixture
+def no_lp_router():
+    """Factory ``NoLPRouter(**kwargs)``; mis. ``no_lp_router(use_dp=False)``."""
+    return NoLPRouter
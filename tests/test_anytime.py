@@ -0,0 +1,50 @@
+# budget_optimizer/tests/test_anytime.py
+
+from budget_optimizer.astar import astar_iter, astar_search
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.simulated_annealing import simulated_annealing_iter
+from budget_optimizer.tests.conftest import BASELINE
+
+
+def test_generators_yield_strictly_better_solutions(baseline):
+    args = (baseline, 2500000, MINIMUMS, 300000)
+
+    improvements = list(astar_iter(*args))
+    scores = [imp["score"] for imp in improvements]
+    assert scores == sorted(set(scores), reverse=True)
+    assert scores[-1] == 0
+    # generator dikonsumsi sampai habis = hasil blocking
+    assert improvements[-1]["final_state"] == astar_search(*args)["final_state"]
+
+    gen = simulated_annealing_iter(*args, seed=3)
+    first = next(gen)
+    assert first["final_state"] == BASELINE  # start state langsung tersedia
+    gen.close()  # caller boleh berhenti kapan saja
+
+
+def test_router_stream_matches_solve(no_lp_router):
+    args = (BASELINE, 2500000, MINIMUMS, 300000, 50000)
+    events = list(no_lp_router(use_dp=False).solve_stream(*args))
+
+    improvements = [e for e in events if e["event"] == "improvement"]
+    assert improvements[0]["tier"] == "Greedy"
+    assert [e["score"] for e in improvements] == sorted(
+        {e["score"] for e in improvements}, reverse=True
+    )
+
+    assert events[-1]["event"] == "result"
+    solved = no_lp_router(use_dp=False).solve(*args)
+    assert events[-1]["result"]["final_state"] == solved["final_state"]
+
+
+def test_router_cancel_before_greedy_incumbent(no_lp_router):
+    args = (BASELINE, 2500000, MINIMUMS, 300000, 50000)
+    events = list(
+        no_lp_router(use_dp=False).solve_stream(
+            *args, progress=lambda info: info.get("tier") != "Greedy"
+        )
+    )
+
+    # greedy tidak sempat jalan → belum ada improvement sama sekali
+    assert [e["event"] for e in events] == ["result"]
+    assert events[-1]["result"]["status"] == "cancelled"
@@ -0,0 +1,116 @@
+# budget_optimizer/tests/test_astar.py
+
+from budget_optimizer.astar import astar_search, friction, neighbors
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.lattice import LatticeEncoder, VisitedSet
+from budget_optimizer.tests.conftest import BASELINE
+
+
+def test_dominated_moves_are_pruned():
+    full = neighbors(BASELINE, 50000, MINIMUMS, 300000)
+    pruned = neighbors(BASELINE, 50000, MINIMUMS, 300000, prune_dominated=True)
+
+    assert len(full) == 13  # tabungan=0 tidak bisa turun
+    # sisa: semua -delta (6) + tabungan +delta
+    assert len(pruned) == 7
+    assert dict(BASELINE, tabungan=50000) in pruned
+
+
+def test_pruning_keeps_result_and_shrinks_tree():
+    on = astar_search(dict(BASELINE), 2500000, MINIMUMS, 300000)
+    off = astar_search(dict(BASELINE), 2500000, MINIMUMS, 300000, prune_dominated=False)
+
+    assert on["status"] == off["status"] == "success"
+    assert on["stats"]["generated"] < off["stats"]["generated"]
+
+
+def test_memory_bounded_modes(baseline):
+    args = (baseline, 2500000, MINIMUMS, 300000)
+    beam = astar_search(*args, mode="beam", beam_width=8)
+    ida = astar_search(*args, mode="ida", max_iter=60000)
+
+    assert beam["status"] == ida["status"] == "success"
+    assert beam["stats"]["frontier_peak"] <= 8 * 2 * len(BASELINE)
+    # IDA* pada f = g + lower_bound → friksi minimum:
+    # tabungan +300k (0.5) + jajan −400k (1.0) + hiburan −200k (1.2)
+    assert friction(BASELINE, ida["final_state"]) == 790000
+
+
+def test_ida_without_target_can_cut_tabungan():
+    # tanpa target tabungan boleh dipotong (w 0.5 = potongan termurah)
+    base = dict(MINIMUMS, tabungan=500000, jajan=100000)
+    args = (base, sum(base.values()) - 300000, MINIMUMS, 0)
+    ida = astar_search(dict(base), *args[1:], mode="ida", max_iter=60000)
+    ref = astar_search(dict(base), *args[1:])
+
+    assert ida["status"] == ref["status"] == "success"
+    assert friction(base, ida["final_state"]) == 150000
+    assert ida["final_state"]["tabungan"] == 200000
+
+
+def test_weighted_astar_reports_bound(baseline):
+    args = (baseline, 2500000, MINIMUMS, 300000)
+    exact = astar_search(*args, epsilon=0)
+    fast = astar_search(*args, epsilon=1.0)
+
+    assert exact["stats"]["suboptimality_bound"] == 1.0
+    bound = fast["stats"]["suboptimality_bound"]
+    assert 1.0 <= bound <= 2.0
+    assert fast["stats"]["cost"] <= bound * exact["stats"]["cost"]
+    assert fast["stats"]["nodes"] < exact["stats"]["nodes"]
+
+
+def test_lattice_visited_set():
+    enc = LatticeEncoder([BASELINE], MINIMUMS, 50000, 300000, 2500000)
+    visited = VisitedSet(enc)
+    assert visited.kind == "bitset"
+
+    codes = set()
+    for nb in neighbors(BASELINE, 50000, MINIMUMS, 300000, prune_dominated=True):
+        cat = next(c for c in nb if nb[c] != BASELINE[c])
+        step = 1 if nb[cat] > BASELINE[cat] else -1
+        code = enc.shift(enc.encode(BASELINE), cat, nb[cat], step)
+        assert code == enc.encode(nb)
+        codes.add(code)
+        assert visited.add(nb, code)
+        assert not visited.add(dict(nb), code)
+
+    assert len(codes) == len(visited) == 7
+    # di luar lattice (grid lain) → fallback key tuple
+    off = dict(BASELINE, jajan=425000)
+    assert enc.encode(off) is None and visited.add(off, None)
+
+
+def test_memory_cap_degrades_to_beam(baseline):
+    args = (baseline, 2000000, MINIMUMS, 500000)
+    res = astar_search(
+        *args, epsilon=0, max_iter=60000, memory_cap=100000, beam_width=16
+    )
+
+    assert res["status"] == "success"
+    assert res["stats"]["degraded"] > 0
+    assert res["stats"]["suboptimality_bound"] is None  # jaminan hilang
+    assert res["trace"][0]["status"] == "degraded"
+    # tanpa cap: ~50k ekspansi, frontier puluhan ribu entry
+    assert res["stats"]["frontier_peak"] < 1000
+
+
+def test_memory_cap_freezes_growing_visited_set(baseline):
+    # tanpa dominance pruning lattice terlalu besar → visited = set integer;
+    # income mustahil → pencarian jalan sampai max_iter
+    res = astar_search(
+        baseline,
+        10000,
+        MINIMUMS,
+        0,
+        prune_dominated=False,
+        max_iter=5000,
+        memory_cap=200000,
+        beam_width=16,
+    )
+
+    assert res["status"] == "partial"
+    frozen = [t["detail"] for t in res["trace"] if "visited_frozen" in t["detail"]]
+    assert len(frozen) == 1
+    assert frozen[0]["visited_bytes"] >= 200000
+    assert res["stats"]["frontier_peak"] < 1000
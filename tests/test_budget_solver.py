@@ -0,0 +1,93 @@
+# budget_optimizer/tests/test_budget_solver.py
+
+import pytest
+
+pytest.importorskip("scipy")
+
+from budget_optimizer.budget_solver import BudgetSolver
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.genai.ai_router import AIRouter
+from budget_optimizer.tests.conftest import BASELINE
+
+
+def _data(income, target, delta=50000):
+    return {
+        "baseline": BASELINE,
+        "income": income,
+        "constraints": {c: {"min": m} for c, m in MINIMUMS.items()},
+        "target": target,
+        "delta": delta,
+    }
+
+
+def test_lp_takes_from_cheapest_category_first():
+    res = BudgetSolver(_data(3000000, 500000)).solve()
+    final = res["solver_panel"]["final_budget"]
+
+    assert res["success"]
+    assert final["tabungan"] == 500000
+    # overspend 300rb diambil dari jajan (bobot termurah selain tabungan)
+    assert final["jajan"] == 100000
+    assert sum(final.values()) <= 3000000
+
+
+def test_lp_rounds_to_delta_grid():
+    res = BudgetSolver(_data(2500000, 1000000, delta=30000)).solve()
+    final = res["solver_panel"]["final_budget"]
+
+    assert res["success"]
+    assert sum(final.values()) <= 2500000
+    assert final["tabungan"] >= 1000000
+    for cat, value in final.items():
+        assert (value - BASELINE[cat]) % 30000 == 0
+        assert value >= MINIMUMS[cat]
+
+
+def test_lp_infeasible():
+    res = BudgetSolver(_data(10000, 0)).solve()
+    assert not res["success"]
+
+
+def test_router_uses_lp_tier_first():
+    res = AIRouter().solve(BASELINE, 3000000, MINIMUMS, 500000, 50000)
+    assert res["trace"][0]["method"] == "LP (HiGHS)"
+    assert len(res["trace"]) == 1
+
+
+def test_router_lp_tier_without_tabungan_key():
+    base = {c: v for c, v in BASELINE.items() if c != "tabungan"}
+    res = AIRouter().solve(base, 2500000, MINIMUMS, 500000, 50000)
+    assert res["trace"][0]["method"] == "LP (HiGHS)"
+    assert res["final_state"]["tabungan"] >= 500000
+
+    # delta=0 → solusi kontinu, tetap int seperti tier lain
+    res = AIRouter().solve(BASELINE, 2500000, MINIMUMS, 500000, 0)
+    assert res["status"] == "success"
+    assert all(type(v) is int for v in res["final_state"].values())
+    assert sum(res["final_state"].values()) <= 2500000
+
+
+def test_batch_matches_single_solves():
+    datas = [_data(3000000, 500000), _data(2500000, 1000000, 30000), _data(10000, 0)]
+    single = [BudgetSolver(d).solve() for d in datas]
+    batch = BudgetSolver.solve_batch(datas)
+
+    # user ke-3 infeasible → fallback per user, dua user lain tetap sukses
+    assert [r["success"] for r in batch] == [True, True, False]
+    for s, b in zip(single[:2], batch[:2]):
+        obj_s = s["solver_panel"]["trace"]["objective"]
+        obj_b = b["solver_panel"]["trace"]["objective"]
+        assert obj_b == pytest.approx(obj_s)
+
+
+def test_batch_single_model():
+    datas = [_data(3000000, 100000 * i) for i in range(1, 6)]
+    batch = BudgetSolver.solve_batch(datas)
+    assert [r["solver_panel"]["final_budget"]["tabungan"] for r in batch] == [
+        100000,
+        200000,
+        300000,
+        400000,
+        500000,
+    ]
+    assert all(r["solver_panel"]["trace"]["raw"] == "batch" for r in batch)
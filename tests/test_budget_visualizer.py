@@ -0,0 +1,46 @@
+# budget_optimizer/tests/test_budget_visualizer.py
+
+import pytest
+
+plt = pytest.importorskip("matplotlib.pyplot")
+
+from budget_optimizer.budget_visualizer import (
+    BudgetVisualizer,
+    render_cache_info,
+)
+
+OUTPUT = {
+    "solver_panel": {
+        "trace": {"baseline": {"kos": 800000, "makan": 600000, "tabungan": 100000}},
+        "final_budget": {"kos": 800000, "makan": 500000, "tabungan": 200000},
+    }
+}
+
+
+def test_render_is_cached_and_closes_figures():
+    viz = BudgetVisualizer(OUTPUT)
+
+    first = viz.render("before_after")
+    hits = render_cache_info().hits
+    second = BudgetVisualizer(OUTPUT).render("before_after")
+
+    assert first.startswith(b"\x89PNG")
+    assert second is first
+    assert render_cache_info().hits == hits + 1
+    assert plt.get_fignums() == []
+
+
+def test_render_svg():
+    svg = BudgetVisualizer(OUTPUT).render("final_pie", fmt="svg")
+    assert b"<svg" in svg
+
+
+def test_plotly_spec_mutation_does_not_touch_cache():
+    pytest.importorskip("plotly")
+    from budget_optimizer.budget_visualizer import plotly_pie_spec
+
+    final = OUTPUT["solver_panel"]["final_budget"]
+    spec = plotly_pie_spec(final)
+    spec["layout"]["title"] = "diubah caller"
+
+    assert plotly_pie_spec(final)["layout"]["title"] != "diubah caller"
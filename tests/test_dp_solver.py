@@ -0,0 +1,72 @@
+# budget_optimizer/tests/test_dp_solver.py
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from budget_optimizer.astar import astar_search, friction
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.dp_solver import dp_optimize
+from budget_optimizer.genai.ai_router import AIRouter
+from budget_optimizer.tests.conftest import BASELINE
+from budget_optimizer.transfer_planner import _apply
+
+
+@pytest.mark.parametrize(
+    "income,target", [(2500000, 300000), (2000000, 500000), (3000000, 1000000)]
+)
+def test_dp_is_oracle_for_astar(income, target, baseline):
+    res = dp_optimize(BASELINE, income, MINIMUMS, target)
+    final = res["final_state"]
+
+    assert res["status"] == "success"
+    assert sum(final.values()) <= income and final["tabungan"] >= target
+    assert _apply(BASELINE, res["moves"]) == final
+
+    # weighted A* dengan bound 1.0 harus sama dengan optimum DP
+    exact = astar_search(
+        baseline, income, MINIMUMS, target, epsilon=0.5, max_iter=60000
+    )
+    assert exact["stats"]["suboptimality_bound"] == 1.0
+    assert friction(BASELINE, exact["final_state"]) == res["cost"]
+
+
+def test_weighted_astar_without_target_matches_dp():
+    # tanpa target: tabungan (w 0.5) potongan overspend termurah
+    base = dict(MINIMUMS, tabungan=500000, jajan=100000)
+    income = sum(base.values()) - 300000
+    res = dp_optimize(base, income, MINIMUMS, 0)
+
+    fast = astar_search(dict(base), income, MINIMUMS, 0, epsilon=0.5, deadline_ms=1000)
+    bound = fast["stats"]["suboptimality_bound"]
+    assert fast["status"] == "success"
+    assert res["cost"] <= fast["stats"]["cost"] <= bound * res["cost"]
+
+    exact = astar_search(dict(base), income, MINIMUMS, 0, epsilon=0)
+    assert exact["stats"]["suboptimality_bound"] == 1.0
+    assert exact["stats"]["cost"] == res["cost"] == 150000
+
+
+def test_exact_tiers_agree_when_tabungan_above_target():
+    # goal semua tier: tabungan = target (bukan ≥), jadi kelebihan tabungan
+    # ikut dikembalikan
+    base = dict(BASELINE, tabungan=600000)
+    args = (base, 3500000, MINIMUMS, 300000)
+
+    dp = dp_optimize(*args)
+    exact = astar_search(dict(base), *args[1:], epsilon=0, max_iter=60000)
+    assert dp["final_state"]["tabungan"] == 300000
+    assert exact["stats"]["cost"] == dp["cost"]
+
+    pytest.importorskip("scipy")
+    lp = AIRouter().try_lp(*args, 50000)
+    assert lp["status"] == "success"
+    assert friction(base, lp["final_state"]) == dp["cost"]
+
+
+def test_dp_infeasible_and_router_tier(no_lp_router):
+    assert dp_optimize(BASELINE, 10000, MINIMUMS, 0)["status"] == "failed"
+
+    res = no_lp_router().solve(BASELINE, 2500000, MINIMUMS, 300000, 50000)
+    assert res["trace"][-1]["method"] == "DP (grid)"
+    assert friction(BASELINE, res["final_state"]) == 790000
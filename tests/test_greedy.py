@@ -0,0 +1,34 @@
+# budget_optimizer/tests/test_greedy.py
+
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.greedy import greedy_optimize
+from budget_optimizer.tests.conftest import BASELINE
+
+
+def test_large_savings_gap_is_closed_in_one_jump():
+    # dulu butuh > max_iter langkah delta
+    res = greedy_optimize(BASELINE, 100_000_000, MINIMUMS, target=50_000_000)
+
+    assert res["status"] == "success"
+    assert res["final_state"]["tabungan"] == 50_000_000
+
+
+def test_overspend_is_cut_from_largest_categories_first():
+    res = greedy_optimize(BASELINE, 2_500_000, MINIMUMS, target=0)
+    final = res["final_state"]
+
+    assert res["status"] == "success"
+    assert sum(final.values()) == 2_500_000
+    # kos & makan (terbesar) dipotong sampai rata dengan sisanya
+    assert final["kos"] == 750_000
+    assert final["makan"] == 750_000
+    assert all(final[c] == BASELINE[c] for c in ("transport", "internet", "jajan"))
+
+
+def test_savings_taken_from_other_categories_when_budget_is_full():
+    res = greedy_optimize(BASELINE, 2_800_000, MINIMUMS, target=300_000)
+    final = res["final_state"]
+
+    assert res["status"] == "success"
+    assert final["tabungan"] == 300_000
+    assert sum(final.values()) <= 2_800_000
@@ -0,0 +1,58 @@
+# budget_optimizer/tests/test_import_time.py
+"""
+Import-time budget check (``python -X importtime``).
+
+Memastikan jalur cold start (package + router) tidak menarik
+library berat, dan total waktu import tetap di bawah budget.
+"""
+
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = {"numpy", "scipy", "matplotlib", "plotly", "pandas", "requests"}
+
+# cumulative import time (mikrodetik) untuk modul-modul di bawah
+IMPORT_BUDGET_US = 300_000
+
+COLD_START_IMPORTS = [
+    "budget_optimizer",
+    "budget_optimizer.genai",
+    "budget_optimizer.genai.ai_router",
+    "budget_optimizer.budget_solver",
+    "budget_optimizer.budget_visualizer",
+]
+
+
+def _importtime(modules):
+    code = "; ".join(f"import {m}" for m in modules)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def test_cold_start_skips_heavy_dependencies():
+    timings = _importtime(COLD_START_IMPORTS)
+    loaded = {name.split(".")[0] for name in timings}
+    assert not loaded & HEAVY_MODULES
+
+
+def test_cold_start_import_budget():
+    timings = _importtime(COLD_START_IMPORTS)
+    total = sum(timings.get(m, 0) for m in COLD_START_IMPORTS)
+    assert total < IMPORT_BUDGET_US
@@ -0,0 +1,87 @@
+# budget_optimizer/tests/test_service.py
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from budget_optimizer.genai.ai_router import AIRouter
+from budget_optimizer.service import BadRequest, ServiceBusy, SolveService, make_server
+from budget_optimizer.tests.conftest import BASELINE
+
+# income di bawah total minimum → LP gagal, A* jalan sampai max_nodes
+SLOW = {"state": BASELINE, "income": 10000, "target": 0}
+
+
+def test_solve_and_validate():
+    svc = SolveService(workers=1, max_pending=0)
+    res = svc.solve({"state": BASELINE, "income": 3000000, "target": 500000})
+    assert res["final_state"]["tabungan"] == 500000
+
+    val = svc.validate({"final_state": res["final_state"], "income": 3000000})
+    assert val["status"] == "success"
+    svc.shutdown()
+
+
+def test_bad_request():
+    svc = SolveService(workers=1)
+    with pytest.raises(BadRequest):
+        svc.solve({"income": 100})
+    with pytest.raises(BadRequest):
+        svc.solve({"state": BASELINE, "income": 100, "deadline_ms": "abc"})
+    with pytest.raises(BadRequest):
+        svc.solve({"state": BASELINE, "income": 100, "minimums": [1, 2]})
+    with pytest.raises(BadRequest):
+        svc.batch_solve({"items": ["bukan object"]})
+    svc.shutdown()
+
+
+def test_http_solver_error_is_500():
+    class Broken(AIRouter):
+        def solve(self, *args, **kwargs):
+            raise RuntimeError("boom")
+
+    server = make_server(port=0, router=Broken(), workers=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+        conn.request("POST", "/solve", json.dumps({"state": BASELINE, "income": 1}))
+        resp = conn.getresponse()
+        assert resp.status == 500
+        assert "boom" in json.loads(resp.read())["error"]
+
+        # Content-Length bukan angka → 400, bukan 500
+        conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+        conn.putrequest("POST", "/solve")
+        conn.putheader("Content-Length", "abc")
+        conn.endheaders()
+        assert conn.getresponse().status == 400
+    finally:
+        server.shutdown()
+        server.service.shutdown()
+        server.server_close()
+
+
+def test_deadline_and_backpressure():
+    svc = SolveService(workers=1, max_pending=0)
+
+    res = svc.solve(dict(SLOW, deadline_ms=20))
+    assert res["status"] == "timeout"
+
+    # batch 2 item > kapasitas (1 worker, 0 antrean) → ditolak
+    with pytest.raises(ServiceBusy):
+        svc.batch_solve({"items": [SLOW, SLOW]})
+    svc.shutdown()
+
+
+def test_failed_submit_returns_slots():
+    svc = SolveService(workers=1, max_pending=1)
+    svc.shutdown()  # executor menolak submit baru
+
+    with pytest.raises(RuntimeError):
+        svc.batch_solve({"items": [SLOW, SLOW]})
+
+    # slot tidak bocor: kapasitas penuh masih bisa diambil
+    assert svc.health()["inflight"] == 0
+    svc._acquire(2)
@@ -0,0 +1,98 @@
+# budget_optimizer/tests/test_simulated_annealing.py
+
+import random
+
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.population_annealing import population_annealing
+from budget_optimizer.simulated_annealing import (
+    IncrementalScore,
+    multi_start_sa,
+    simulated_annealing,
+)
+
+BASELINE = {
+    "kos": 1000000,
+    "makan": 800000,
+    "transport": 0,
+    "internet": 100000,
+    "jajan": 400000,
+    "hiburan": 300000,
+    "tabungan": 0,
+}
+
+
+def test_incremental_score_matches_full_recompute():
+    rng = random.Random(0)
+    state = dict(BASELINE)
+    cur = IncrementalScore(state, 2500000, MINIMUMS, target=400000)
+
+    for _ in range(500):
+        cat = rng.choice(list(state))
+        amount = rng.choice([-1, 1]) * 50000
+        predicted = cur.score + cur.delta(cat, amount)
+        cur.apply(cat, amount)
+
+        fresh = IncrementalScore(dict(state), 2500000, MINIMUMS, target=400000)
+        assert cur.spend == sum(state.values())
+        assert cur.score == fresh.score == predicted
+
+
+def test_sa_does_not_mutate_input():
+    before = dict(BASELINE)
+    simulated_annealing(BASELINE, 2500000, MINIMUMS, 400000)
+    assert BASELINE == before
+
+
+def test_transfer_moves_keep_total_and_count_proposals():
+    random.seed(3)
+    res = simulated_annealing(
+        BASELINE, 2500000, MINIMUMS, 400000, steps=400, move_set="transfer"
+    )
+    stats = res["stats"]
+
+    assert sum(res["final_state"].values()) == sum(BASELINE.values())
+    assert stats["accepted"] + stats["rejected"] + stats["infeasible"] == 400
+    assert stats["infeasible"] == 0
+
+
+def test_multi_start_is_reproducible_across_workers():
+    kwargs = dict(seeds=[11, 7, 3], steps=300, move_set="mixed")
+    serial = multi_start_sa(BASELINE, 2500000, MINIMUMS, 400000, workers=1, **kwargs)
+    parallel = multi_start_sa(BASELINE, 2500000, MINIMUMS, 400000, workers=2, **kwargs)
+
+    assert serial == parallel
+    assert [c["seed"] for c in serial["chains"]] == [11, 7, 3]
+    assert serial["score"] == min(c["score"] for c in serial["chains"])
+
+
+def test_population_annealing_matches_sa_result_shape():
+    sa = simulated_annealing(BASELINE, 2500000, MINIMUMS, 400000, steps=50, seed=0)
+    pa = population_annealing(
+        BASELINE, 2500000, MINIMUMS, 400000, n_chains=64, steps=300, seed=0
+    )
+
+    assert set(pa) == set(sa)
+    assert pa == population_annealing(
+        BASELINE, 2500000, MINIMUMS, 400000, n_chains=64, steps=300, seed=0
+    )
+    final = pa["final_state"]
+    assert pa["score"] == IncrementalScore(dict(final), 2500000, MINIMUMS, 400000).score
+    assert all(final[c] >= MINIMUMS[c] for c in final)
+
+
+def test_adaptive_schedule_stops_early_on_easy_input():
+    easy = dict(BASELINE, transport=50000)
+    res = simulated_annealing(
+        easy, 3500000, MINIMUMS, 400000, steps=3000, seed=1, schedule="adaptive"
+    )
+
+    assert res["score"] == 0
+    assert res["stats"]["steps"] < 300
+
+
+def test_overspent_start_can_move_down():
+    # total 2.65jt > income 2.5jt + delta: move turun tetap harus boleh
+    res = simulated_annealing(
+        BASELINE, 2500000, MINIMUMS, 0, seed=1, schedule="adaptive", reheats=4
+    )
+    assert sum(res["final_state"].values()) <= 2500000
@@ -0,0 +1,24 @@
+# budget_optimizer/tests/test_solver_jobs.py
+
+import time
+
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.genai.solver_jobs import submit_solve
+from budget_optimizer.tests.conftest import BASELINE
+
+
+def test_job_returns_router_result():
+    job = submit_solve(BASELINE, 3000000, MINIMUMS, 500000, 50000)
+    res = job.result(timeout=30)
+    assert job.done()
+    assert res["status"] in ("success", "warning")
+    assert job.progress()["tier"] is not None
+
+
+def test_job_can_be_cancelled():
+    # income di bawah total minimum → LP gagal, A* jalan sampai max_nodes
+    job = submit_solve(BASELINE, 10000, MINIMUMS, 0, 50000)
+    time.sleep(0.05)
+    job.cancel()
+    res = job.result(timeout=30)
+    assert res["status"] == "cancelled"
@@ -0,0 +1,30 @@
+# budget_optimizer/tests/test_tabu_search.py
+
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.genai.ai_router import AIRouter
+from budget_optimizer.tabu_search import tabu_search
+from budget_optimizer.tests.conftest import BASELINE
+
+
+def test_tabu_reaches_target_deterministically():
+    res = tabu_search(BASELINE, 2500000, MINIMUMS, 300000)
+    again = tabu_search(BASELINE, 2500000, MINIMUMS, 300000)
+
+    assert res["status"] == "success"
+    assert res["score"] == 0
+    assert res["final_state"] == again["final_state"]
+    assert res["stats"] == again["stats"]
+
+    final = res["final_state"]
+    assert sum(final.values()) <= 2500000
+    assert final["tabungan"] >= 300000
+    assert all(final[c] >= m for c, m in MINIMUMS.items() if c in final)
+
+
+def test_tabu_router_tier_shape():
+    res = AIRouter().try_tabu(BASELINE, 2500000, MINIMUMS, 300000, 50000)
+
+    assert res["method"] == "Tabu Search"
+    assert res["status"] == "success"
+    assert res["final_state"]["tabungan"] >= 300000
+    assert {"iterations", "aspirations", "evaluated"} <= set(res["detail"])
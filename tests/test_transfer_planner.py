@@ -0,0 +1,66 @@
+# budget_optimizer/tests/test_transfer_planner.py
+
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.models import Action
+from budget_optimizer.tests.conftest import BASELINE
+from budget_optimizer.transfer_planner import (
+    INCOME,
+    pareto_front,
+    plan_between,
+    plan_transfers,
+    sweep_targets,
+)
+
+
+def test_plan_moves_cheapest_money_to_tabungan():
+    res = plan_transfers(BASELINE, 3000000, MINIMUMS, target=500000)
+
+    assert res["status"] == "success"
+    assert res["actions"] == [
+        Action(src="jajan", dst="tabungan", amount=300000, cost=450000.0),
+        Action(src=INCOME, dst="tabungan", amount=200000, cost=100000.0),
+    ]
+    assert res["final_state"]["tabungan"] == 500000
+    assert sum(res["final_state"].values()) == 3000000
+
+
+def test_plan_cuts_overspend():
+    res = plan_transfers(BASELINE, 2000000, MINIMUMS, target=300000)
+    final = res["final_state"]
+
+    assert res["status"] == "success"
+    assert sum(final.values()) <= 2000000
+    assert final["tabungan"] >= 300000
+    assert all(final[c] >= MINIMUMS[c] for c in final)
+    # kos (bobot paling mahal) tidak disentuh
+    assert final["kos"] == BASELINE["kos"]
+
+
+def test_plan_infeasible_is_partial():
+    res = plan_transfers(BASELINE, 10000, MINIMUMS, target=0)
+    assert res["status"] == "partial"
+
+
+def test_plan_between_explains_any_result():
+    after = dict(BASELINE, jajan=100000, hiburan=200000, tabungan=400000)
+    actions = plan_between(BASELINE, after)
+
+    assert sum(a.amount for a in actions if a.dst == "tabungan") == 400000
+    assert {a.src for a in actions} == {"jajan", "hiburan"}
+
+
+def test_sweep_matches_individual_plans():
+    targets = list(range(0, 3000001, 100000))
+    sweep = sweep_targets(BASELINE, 3000000, MINIMUMS, targets)
+
+    assert [p["target"] for p in sweep] == targets
+    for t, point in zip(targets, sweep):
+        res = plan_transfers(BASELINE, 3000000, MINIMUMS, target=t)
+        assert (point["status"] == "success") == (res["status"] == "success")
+        if point["status"] == "success":
+            assert point["final_state"]["tabungan"] >= t
+            assert abs(point["friction"] - res["cost"]) < 1e-6
+
+    assert sweep[-1]["status"] == "infeasible"
+    front = pareto_front(sweep)
+    assert [p["friction"] for p in front] == sorted(p["friction"] for p in front)
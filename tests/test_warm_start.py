@@ -0,0 +1,85 @@
+# budget_optimizer/tests/test_warm_start.py
+
+from budget_optimizer.astar import astar_search, friction
+from budget_optimizer.config import MINIMUMS
+from budget_optimizer.genai.ai_router import AIRouter
+from budget_optimizer.greedy import greedy_optimize
+from budget_optimizer.simulated_annealing import simulated_annealing
+from budget_optimizer.tests.conftest import BASELINE
+
+
+def _previous(target):
+    return astar_search(dict(BASELINE), 3000000, MINIMUMS, target, max_iter=5000)
+
+
+def test_astar_warm_start_needs_few_expansions():
+    prev = _previous(500000)["final_state"]
+
+    cold = astar_search(dict(BASELINE), 3000000, MINIMUMS, 600000, max_iter=5)
+    warm = astar_search(
+        dict(BASELINE), 3000000, MINIMUMS, 600000, max_iter=5, warm_start=prev
+    )
+
+    assert cold["status"] == "partial"
+    assert warm["status"] == "success"
+    assert warm["final_state"]["tabungan"] == 600000
+
+
+def test_sa_chain_starts_from_warm_start():
+    prev = _previous(500000)["final_state"]
+    res = simulated_annealing(
+        BASELINE, 3000000, MINIMUMS, 500000, steps=0, warm_start=prev
+    )
+    assert res["final_state"] == prev
+
+
+def test_router_accepts_warm_start():
+    prev = _previous(500000)["final_state"]
+    args = (BASELINE, 2900000, MINIMUMS, 550000, 50000)
+    res = AIRouter().solve(*args, warm_start=prev)
+
+    assert res["status"] == "success"
+    assert res["final_state"]["tabungan"] >= 550000
+    assert sum(res["final_state"].values()) <= 2900000
+    # tier exact (LP / DP) tidak memakai warm_start: hasilnya sama
+    assert res["final_state"] == AIRouter().solve(*args)["final_state"]
+
+
+def test_greedy_incumbent_bounds_astar(no_lp_router):
+    res = no_lp_router(use_dp=False).solve(BASELINE, 2500000, MINIMUMS, 300000, 50000)
+    a_star = res["trace"][1]
+
+    assert a_star["method"] == "A* Search"
+    assert a_star["status"] == "success"
+    assert a_star["detail"]["pruned"] > 0
+
+    greedy = greedy_optimize(BASELINE, 2500000, MINIMUMS, 300000)["final_state"]
+    assert friction(BASELINE, res["final_state"]) < friction(BASELINE, greedy)
+
+
+def test_router_warm_start_seeds_heuristic_tiers(no_lp_router):
+    prev = _previous(500000)["final_state"]
+    args = (BASELINE, 3000000, MINIMUMS, 600000, 50000)
+    router = no_lp_router(use_dp=False, max_nodes=5)
+
+    cold = router.solve(*args)
+    warm = router.solve(*args, warm_start=prev)
+
+    assert cold["trace"][1]["status"] == "partial"
+    assert warm["trace"][1]["method"] == "A* Search"
+    assert warm["trace"][1]["status"] == "success"
+
+
+def test_router_warm_start_survives_small_income_change(no_lp_router):
+    prev = _previous(500000)["final_state"]  # di-solve dengan income 3.000.000
+    args = (BASELINE, 3050000, MINIMUMS, 600000, 50000)
+    router = no_lp_router(use_dp=False, max_nodes=5)
+
+    assert router.solve(*args)["trace"][1]["status"] == "partial"
+    warm = router.solve(*args, warm_start=prev)
+    assert warm["trace"][1]["status"] == "success"
+    assert sum(warm["final_state"].values()) <= 3050000
+
+    # kategori lain (baseline berubah) → warm start diabaikan, tidak crash
+    other = dict(prev, lainnya=0)
+    assert router.solve(*args, warm_start=other)["trace"][1]["status"] == "partial"
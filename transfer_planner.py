@@ -0,0 +1,432 @@
+# budget_optimizer/transfer_planner.py
+"""
+Transfer Planner (Min-Cost Flow)
+--------------------------------
+Menghasilkan rencana pemindahan uang yang bisa dijelaskan ke user:
+"pindahkan Rp 300.000 dari jajan ke tabungan".
+
+Rebalancing dimodelkan sebagai min-cost flow:
+- source  : kategori surplus (di atas minimum / target) + sisa income
+- sink    : kategori defisit (terutama tabungan) + overspend yang harus dipotong
+- biaya   : BOBOT[src] + BOBOT[dst] per rupiah (sama dengan objective L1 di LP)
+
+Diselesaikan dengan successive shortest path (Bellman-Ford di residual graph):
+polinomial, exact, dan hasilnya satu Action per pasangan (src, dst).
+
+Node khusus INCOME mewakili uang di luar alokasi:
+- src = "income"  → memakai sisa income yang belum dialokasikan
+- dst = "income"  → memotong overspend (total > income)
+
+``sweep_targets`` menyelesaikan satu grid target tabungan sekaligus: flow
+untuk target t dipakai sebagai warm start untuk target t + delta.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .config import BOBOT
+from .models import Action
+
+INCOME = "income"
+
+_SOURCE = "__source__"
+_SINK = "__sink__"
+
+
+# ============================================================
+# 1. Min-cost flow (successive shortest path)
+# ============================================================
+class MinCostFlow:
+    """
+    Min-cost flow kecil berbasis adjacency list + residual edges.
+
+    ``augment(limit)`` bisa dipanggil berulang (resumable): flow yang sudah
+    ada dipertahankan, jadi menambah demand lalu augment lagi = warm start.
+    """
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.graph: List[List[list]] = []  # edge: [to, cap, cost, rev_idx]
+        self.edges: List[Tuple[str, str, int, int]] = []  # edge asli
+        self.flow = 0
+        self.cost = 0.0
+
+    def node(self, name: str) -> int:
+        if name not in self.index:
+            self.index[name] = len(self.graph)
+            self.graph.append([])
+        return self.index[name]
+
+    def add_edge(self, u: str, v: str, cap: int, cost: float) -> Tuple[int, int]:
+        """Tambah edge u→v; return handle (u_idx, edge_idx) untuk update cap."""
+        a, b = self.node(u), self.node(v)
+        self.graph[a].append([b, cap, cost, len(self.graph[b])])
+        self.graph[b].append([a, 0, -cost, len(self.graph[a]) - 1])
+        self.edges.append((u, v, a, len(self.graph[a]) - 1))
+        return a, len(self.graph[a]) - 1
+
+    def add_capacity(self, handle: Tuple[int, int], extra: int):
+        a, i = handle
+        self.graph[a][i][1] += extra
+
+    def _shortest_path(self, s: int, t: int, avoid: Optional[int] = None):
+        n = len(self.graph)
+        dist = [float("inf")] * n
+        prev = [None] * n
+        dist[s] = 0.0
+
+        # Bellman-Ford (residual graph punya edge berbiaya negatif)
+        for _ in range(n - 1):
+            updated = False
+            for u in range(n):
+                if dist[u] == float("inf") or u == avoid:
+                    continue
+                for i, (v, cap, cost, _) in enumerate(self.graph[u]):
+                    if v != avoid and cap > 0 and dist[u] + cost < dist[v] - 1e-12:
+                        dist[v] = dist[u] + cost
+                        prev[v] = (u, i)
+                        updated = True
+            if not updated:
+                break
+
+        return (dist[t], prev) if dist[t] != float("inf") else (None, None)
+
+    def augment(
+        self,
+        source: str,
+        sink: str,
+        limit: Optional[int] = None,
+        avoid: Optional[str] = None,
+    ) -> int:
+        """
+        Alirkan flow termurah s→t sampai ``limit`` (None = maksimum).
+
+        ``avoid``: node yang tidak boleh dilewati path (mis. sink lain yang
+        flow-nya harus tetap, supaya augment tidak me-reroute demand itu).
+        """
+        s, t = self.node(source), self.node(sink)
+        skip = self.node(avoid) if avoid is not None else None
+        pushed = 0
+
+        while limit is None or pushed < limit:
+            dist, prev = self._shortest_path(s, t, skip)
+            if dist is None:
+                break
+
+            # bottleneck di sepanjang path
+            f = None if limit is None else limit - pushed
+            v = t
+            while v != s:
+                u, i = prev[v]
+                cap = self.graph[u][i][1]
+                f = cap if f is None else min(f, cap)
+                v = u
+
+            v = t
+            while v != s:
+                u, i = prev[v]
+                edge = self.graph[u][i]
+                edge[1] -= f
+                self.graph[v][edge[3]][1] += f
+                v = u
+
+            pushed += f
+            self.flow += f
+            self.cost += f * dist
+
+        return pushed
+
+    def edge_flows(self) -> Dict[Tuple[str, str], int]:
+        """Flow positif per edge asli (u, v) — flow = kapasitas reverse edge."""
+        flows = {}
+        for u, v, a, i in self.edges:
+            to, _, _, rev = self.graph[a][i]
+            f = self.graph[to][rev][1]
+            if f > 0:
+                flows[(u, v)] = flows.get((u, v), 0) + f
+        return flows
+
+
+# ============================================================
+# 2. Transportation problem: supply → demand
+# ============================================================
+def _build_network(
+    supply: Dict[str, int], demand: Dict[str, int], weights: Dict[str, float]
+):
+    mcf = MinCostFlow()
+    for src, cap in supply.items():
+        if cap > 0:
+            mcf.add_edge(_SOURCE, "out:" + src, cap, 0.0)
+    sink_edges = {}
+    for dst, need in demand.items():
+        sink_edges[dst] = mcf.add_edge("in:" + dst, _SINK, max(need, 0), 0.0)
+
+    for src, cap in supply.items():
+        if cap <= 0:
+            continue
+        for dst in demand:
+            if src == dst or (src == INCOME and dst == INCOME):
+                continue
+            cost = weights.get(src, 0.0) + weights.get(dst, 0.0)
+            mcf.add_edge("out:" + src, "in:" + dst, cap, cost)
+
+    return mcf, sink_edges
+
+
+def _flows_to_actions(mcf: MinCostFlow, weights, unit: int) -> List[Action]:
+    actions = []
+    for (u, v), f in mcf.edge_flows().items():
+        if not (u.startswith("out:") and v.startswith("in:")):
+            continue
+        src, dst = u[4:], v[3:]
+        amount = f * unit
+        cost = amount * (weights.get(src, 0.0) + weights.get(dst, 0.0))
+        actions.append(Action(src=src, dst=dst, amount=amount, cost=cost))
+
+    actions.sort(key=lambda a: (-a.amount, a.src, a.dst))
+    return actions
+
+
+def _weights(weights: Optional[Dict[str, float]]) -> Dict[str, float]:
+    w = dict(BOBOT if weights is None else weights)
+    w[INCOME] = 0.0
+    return w
+
+
+def _apply(state: Dict[str, int], actions: List[Action]) -> Dict[str, int]:
+    final = dict(state)
+    for a in actions:
+        if a.src != INCOME:
+            final[a.src] -= a.amount
+        if a.dst != INCOME:
+            final[a.dst] += a.amount
+    return final
+
+
+def plan_between(
+    before: Dict[str, int],
+    after: Dict[str, int],
+    weights: Optional[Dict[str, float]] = None,
+) -> List[Action]:
+    """
+    Jelaskan perubahan before → after (hasil solver apa pun) sebagai daftar
+    Action termurah. Selisih total dianggap berasal dari / kembali ke income.
+    """
+    w = _weights(weights)
+
+    supply, demand = {}, {}
+    for cat in before:
+        diff = after.get(cat, 0) - before[cat]
+        if diff < 0:
+            supply[cat] = -diff
+        elif diff > 0:
+            demand[cat] = diff
+
+    total_diff = sum(after.values()) - sum(before.values())
+    if total_diff > 0:
+        supply[INCOME] = total_diff
+    elif total_diff < 0:
+        demand[INCOME] = -total_diff
+
+    mcf, _ = _build_network(supply, demand, w)
+    mcf.augment(_SOURCE, _SINK)
+    return _flows_to_actions(mcf, w, 1)
+
+
+# ============================================================
+# 3. Planner utama: baseline → rencana transfer optimal
+# ============================================================
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def transfer_problem(init_state, income, minimums, target, delta):
+    """
+    Supply & demand (dalam unit ``delta``) untuk mencapai:
+    semua kategori ≥ minimum, tabungan ≥ target, total ≤ income.
+    """
+    floors = {cat: minimums.get(cat, 0) for cat in init_state}
+    if target and "tabungan" in floors:
+        floors["tabungan"] = max(floors["tabungan"], target)
+
+    supply, demand = {}, {}
+    for cat, v in init_state.items():
+        if v >= floors[cat]:
+            supply[cat] = (v - floors[cat]) // delta
+        else:
+            demand[cat] = _ceil_div(floors[cat] - v, delta)
+
+    spend = sum(init_state.values())
+    if spend <= income:
+        supply[INCOME] = (income - spend) // delta
+    else:
+        demand[INCOME] = _ceil_div(spend - income, delta)
+
+    return supply, demand
+
+
+def plan_transfers(
+    init_state: Dict[str, int],
+    income: int,
+    minimums: Dict[str, int],
+    target: Optional[int] = None,
+    delta: int = 50000,
+    weights: Optional[Dict[str, float]] = None,
+):
+    """
+    Rencana pemindahan termurah (min-cost flow) dari baseline ke kondisi
+    feasible: minimum terpenuhi, tabungan ≥ target, total ≤ income.
+
+    Return format sama dengan solver lain + "actions" (List[Action]) dan
+    "cost" (total friksi = Σ amount · (BOBOT[src] + BOBOT[dst])).
+    """
+    w = _weights(weights)
+    supply, demand = transfer_problem(init_state, income, minimums, target, delta)
+
+    mcf, _ = _build_network(supply, demand, w)
+    mcf.augment(_SOURCE, _SINK)
+
+    actions = _flows_to_actions(mcf, w, delta)
+    need = sum(max(d, 0) for d in demand.values())
+
+    return {
+        "final_state": _apply(init_state, actions),
+        "method": "min_cost_flow",
+        "status": "success" if mcf.flow >= need else "partial",
+        "actions": actions,
+        "cost": sum(a.cost for a in actions),
+        "trace": [],
+    }
+
+
+# ============================================================
+# 4. Parametric sweep: semua target tabungan sekaligus
+# ============================================================
+SWEEP_CACHE_SIZE = 32
+
+_SAVINGS = "__savings__"
+
+
+def _savings_demand(v: int, floor: int, supply: int, target: int, delta: int) -> int:
+    """
+    Unit yang harus masuk ke in:tabungan untuk target tertentu.
+
+    Tabungan boleh melepas netto paling banyak (v - max(min, t)) // delta
+    unit. Dengan edge keep (out:tabungan → in:tabungan, biaya 0), syarat itu
+    setara dengan demand in:tabungan = supply - batas tersebut, yang naik
+    tepat 1 unit setiap target naik satu delta.
+    """
+    return max(supply - (v - max(floor, target)) // delta, 0)
+
+
+@lru_cache(maxsize=SWEEP_CACHE_SIZE)
+def _sweep_cached(state_items, income, minimum_items, targets, delta, weight_items):
+    init_state = dict(state_items)
+    minimums = dict(minimum_items)
+    w = _weights(dict(weight_items) if weight_items is not None else None)
+
+    supply, demand = transfer_problem(init_state, income, minimums, 0, delta)
+    v, floor = init_state["tabungan"], minimums.get("tabungan", 0)
+    own = supply.get("tabungan", 0)
+    demand.pop("tabungan", None)
+
+    # tabungan: sink terpisah (_SAVINGS) supaya demand-nya bisa dinaikkan
+    # tanpa menyentuh flow ke demand lain yang sudah optimal
+    mcf, _ = _build_network(supply, dict(demand, tabungan=0), w)
+    savings_edge = mcf.add_edge("in:tabungan", _SAVINGS, 0, 0.0)
+    if own > 0:
+        mcf.add_edge("out:tabungan", "in:tabungan", own, 0.0)
+
+    # fase 1: minimum + overspend (sama dengan plan_transfers target=0)
+    feasible = mcf.augment(_SOURCE, _SINK) >= sum(demand.values())
+
+    # fase 2: naikkan target; tiap unit = shortest path ke tabungan di
+    # residual graph (boleh me-reroute transfer lama, tidak lewat _SINK)
+    points, current = [], 0
+    for target in targets:
+        need = _savings_demand(v, floor, own, target, delta)
+        if feasible and need > current:
+            mcf.add_capacity(savings_edge, need - current)
+            pushed = mcf.augment(_SOURCE, _SAVINGS, need - current, avoid=_SINK)
+            feasible = pushed == need - current
+            current = need
+
+        if not feasible:
+            # demand hanya bisa naik → target lebih tinggi juga infeasible
+            points.extend(
+                {"target": t, "status": "infeasible", "final_state": None}
+                for t in targets[len(points) :]
+            )
+            break
+
+        actions = [a for a in _flows_to_actions(mcf, w, delta) if a.src != a.dst]
+        final = _apply(init_state, actions)
+        points.append(
+            {
+                "target": target,
+                "status": "success",
+                "final_state": final,
+                "actions": actions,
+                "friction": sum(a.cost for a in actions),
+                "savings": final["tabungan"],
+            }
+        )
+
+    return tuple(points)
+
+
+def sweep_targets(
+    init_state: Dict[str, int],
+    income: int,
+    minimums: Dict[str, int],
+    targets: Sequence[int],
+    delta: int = 50000,
+    weights: Optional[Dict[str, float]] = None,
+) -> List[Dict]:
+    """
+    Alokasi optimal untuk setiap target di ``targets`` dalam satu pass.
+
+    Target diproses naik; flow target sebelumnya dipertahankan dan hanya
+    demand tabungan yang ditambah lalu di-augment (warm start), jadi satu
+    titik grid biasanya = satu augmenting path. Hasil di-cache per
+    (baseline, income, minimums, grid, delta, weights).
+
+    Return list (urutan = ``targets``) berisi dict: target, status,
+    final_state, actions, friction (Σ Action.cost), savings.
+    """
+    if "tabungan" not in init_state:
+        raise ValueError("Baseline tidak punya kategori 'tabungan'")
+
+    ordered = tuple(sorted(set(int(t) for t in targets)))
+    points = _sweep_cached(
+        tuple(sorted(init_state.items())),
+        income,
+        tuple(sorted(minimums.items())),
+        ordered,
+        delta,
+        tuple(sorted(weights.items())) if weights is not None else None,
+    )
+    by_target = {p["target"]: p for p in points}
+
+    # salinan supaya caller tidak bisa merusak isi cache
+    result = []
+    for t in targets:
+        p = dict(by_target[int(t)])
+        if p["final_state"] is not None:
+            p["final_state"] = dict(p["final_state"])
+            p["actions"] = list(p["actions"])
+        result.append(p)
+    return result
+
+
+def pareto_front(points: List[Dict]) -> List[Dict]:
+    """Titik feasible yang tidak didominasi (savings lebih tinggi, friksi lebih rendah)."""
+    front = []
+    for p in sorted(
+        (p for p in points if p["status"] == "success"),
+        key=lambda p: (p["savings"], -p["friction"]),
+        reverse=True,
+    ):
+        if not front or p["friction"] < front[-1]["friction"]:
+            front.append(p)
+    return front[::-1]
@@ -27,3 +27,32 @@ def normalize_state(state: State, income: int) -> State:
         excess -= deduction
 
     return State.from_dict(d)
+
+
+def seed_state(init_state: dict, warm_start: dict = None) -> dict:
+    """
+    Titik awal solver: salinan ``warm_start`` (solusi sebelumnya) jika
+    kategorinya sama dengan ``init_state``, selain itu salinan baseline.
+    """
+    if warm_start and set(warm_start) == set(init_state):
+        return dict(warm_start)
+    return dict(init_state)
+
+
+def improvement(method: str, state: dict, score, stats: dict) -> dict:
+    """Payload yang di-yield solver anytime untuk setiap solusi yang lebih baik."""
+    return {
+        "method": method,
+        "final_state": dict(state),
+        "score": score,
+        "stats": dict(stats),
+    }
+
+
+def drain(gen):
+    """Jalankan generator anytime sampai habis; return nilai ``return``-nya."""
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value